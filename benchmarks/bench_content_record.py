@@ -0,0 +1,102 @@
+"""
+Compares content items stored as dicts (the way they used to be) with RBContent records, by memory use and by how
+long templates take to look their fields up.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.bench_content_record --items 100000
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+import tracemalloc
+
+from jinja2 import Environment
+
+from rootbeerSSG.content import RBContent
+
+SITE = SimpleNamespace(date_format='%m/%d/%y at %H:%M', out_dir='public', blog_dir='blog', pretty_p=False,
+                       pretty_p_pages=True)
+
+
+def make_dict_items(count: int) -> list:
+    items: list = list()
+    for number in range(count):
+        date: datetime = datetime(2000, 1, 1) + timedelta(hours=number)
+        slug: str = f'post-{number}'
+        items.append({
+            'file_name': f'content/posts/{slug}.md',
+            'metadata': {'title': f'Post {number}', 'date': date.strftime(SITE.date_format), 'type': 'post'},
+            'date': date,
+            'readable_date': date.strftime(SITE.date_format.replace('%H:%M', '%I:%M %p')),
+            'slug': slug,
+            'content_path_url': f'{SITE.out_dir}/{SITE.blog_dir}/{date.year}/{date.month:0>2}/{date.day:0>2}/{slug}',
+            'url': f'{SITE.blog_dir}/{date.year}/{date.month:0>2}/{date.day:0>2}/{slug}',
+            'summary': '',
+            'content': '',
+        })
+    return items
+
+
+def make_record_items(count: int) -> list:
+    items: list = list()
+    for number in range(count):
+        date: datetime = datetime(2000, 1, 1) + timedelta(hours=number)
+        slug: str = f'post-{number}'
+        item: RBContent = RBContent(SITE, f'content/posts/{slug}.md',
+                                    {'title': f'Post {number}', 'date': date.strftime(SITE.date_format),
+                                     'type': 'post'})
+        item.date = date
+        item.slug = slug
+        item.summary = ''
+        item.content = ''
+        items.append(item)
+    return items
+
+
+def measure_memory(make_items, count: int) -> int:
+    tracemalloc.start()
+    items: list = make_items(count)
+    # ? The records work out their url, readable_date, ... on first use, so they are measured after they are used.
+    measure_lookups(items)
+    size: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def measure_lookups(items: list) -> float:
+    # ? Looks the fields up the same way templates do ("post.url", "post.readable_date", ...).
+    getattr_ = Environment().getattr
+    start: float = perf_counter()
+    for item in items:
+        getattr_(item, 'url')
+        getattr_(item, 'readable_date')
+        getattr_(getattr_(item, 'metadata'), 'title')
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=100000)
+    options = parser.parse_args()
+
+    dict_memory: int = measure_memory(make_dict_items, options.items)
+    record_memory: int = measure_memory(make_record_items, options.items)
+    dict_time: float = measure_lookups(make_dict_items(options.items))
+    record_items: list = make_record_items(options.items)
+    first_time: float = measure_lookups(record_items)
+    record_time: float = measure_lookups(record_items)
+
+    print(f'{options.items} items')
+    print(f'{"":>24} {"memory (MiB)":>14} {"lookups (s)":>12}')
+    print(f'{"dict":>24} {dict_memory / 1024 / 1024:14.1f} {dict_time:12.4f}')
+    print(f'{"RBContent (first use)":>24} {record_memory / 1024 / 1024:14.1f} {first_time:12.4f}')
+    print(f'{"RBContent (cached)":>24} {"":>14} {record_time:12.4f}')
+    print(f'The first lookups are {first_time / dict_time:.1f}x as slow as with dicts, the cached ones '
+          f'{record_time / dict_time:.1f}x.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares the old way content was sorted (sorting the whole list twice after every loaded file) with rb_sort_content.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.bench_sort --sizes 1000 5000 10000 100000
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from random import Random
+from time import perf_counter
+from types import SimpleNamespace
+
+from rootbeerSSG.content import RBContent
+from rootbeerSSG.utils import rb_sort_content
+
+SITE = SimpleNamespace(date_format='%m/%d/%y at %H:%M', out_dir='public', blog_dir='blog', pretty_p=False,
+                       pretty_p_pages=True)
+
+
+def make_items(count: int, seed: int = 0) -> list:
+    random: Random = Random(seed)
+    start: datetime = datetime(2000, 1, 1)
+    items: list = list()
+    for number in range(count):
+        date: datetime = start + timedelta(minutes=random.randrange(10_000_000))
+        item: RBContent = RBContent(SITE, f'content/posts/post-{number}.md',
+                                    {'title': f'Post {random.randrange(count)}', 'type': 'post'})
+        item.date = date
+        item.slug = f'post-{number}'
+        items.append(item)
+    return items
+
+
+def old_sort(items: list) -> list:
+    content: list = list()
+    for item in items:
+        content.append(item)
+        for content_type in ['post', 'page']:
+            content.sort(key=lambda x: 'date', reverse=True)
+    return content
+
+
+def new_sort(items: list) -> list:
+    return rb_sort_content(items, 'date', reverse=True)
+
+
+def time_it(function, items: list) -> float:
+    start: float = perf_counter()
+    function(items)
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 10000, 100000])
+    parser.add_argument('--old-max', type=int, default=10000,
+                        help='The largest size the old, quadratic sort is timed at.')
+    options = parser.parse_args()
+
+    print(f'{"items":>8} {"old (s)":>10} {"new (s)":>10}')
+    for size in options.sizes:
+        items: list = make_items(size)
+        old: str = f'{time_it(old_sort, items):10.4f}' if size <= options.old_max else f'{"-":>10}'
+        print(f'{size:>8} {old} {time_it(new_sort, items):10.4f}')
+
+
+if __name__ == '__main__':
+    main()
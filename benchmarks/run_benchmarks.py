@@ -0,0 +1,134 @@
+"""
+Runs the full build pipeline on synthetic sites of different sizes and reports how it scales.
+
+Every size is built in its own process with the RBDefault theme and profiled (without tracemalloc, which would slow
+the build down), so the numbers don't affect each other.
+The results are saved as JSON and can be compared with an earlier run to catch regressions:
+
+    python -m benchmarks.run_benchmarks --sizes 100 1000 10000 --save benchmarks/results/main.json
+    python -m benchmarks.run_benchmarks --sizes 100 1000 10000 --compare benchmarks/results/main.json
+"""
+from argparse import ArgumentParser
+from datetime import datetime
+from subprocess import DEVNULL, check_call
+from sys import executable
+from tempfile import TemporaryDirectory
+import json
+import os
+
+from .synthetic_site import generate_site
+
+REPOSITORY: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The metrics that are compared, and whether a larger number is better.
+METRICS: dict = {'pages_per_second': True, 'total_wall': False, 'max_rss': False, 'max_rss_children': False}
+
+
+def run_size(size: int, jobs: int, pages_ratio: float, paragraphs: int, static_files: int,
+             markdown_cache: bool) -> dict:
+    pages: int = max(1, int(size * pages_ratio))
+    posts: int = size - pages
+
+    with TemporaryDirectory(prefix=f'rootbeer-bench-{size}-') as root:
+        generate_site(root, posts=posts, pages=pages, paragraphs=paragraphs, static_files=static_files,
+                      markdown_cache=markdown_cache, jobs=jobs)
+
+        environment: dict = dict(os.environ)
+        environment['PYTHONPATH'] = os.pathsep.join(filter(None, [REPOSITORY, environment.get('PYTHONPATH')]))
+        command: list = [executable, '-m', 'rootbeerSSG', 'build', '--profile-without-tracemalloc', '--profile-json',
+                         f'{root}/profile.json']
+        if markdown_cache:
+            # ? Warms the cache first so only the cached build is measured.
+            check_call(command[:4], cwd=root, env=environment, stdout=DEVNULL)
+        check_call(command, cwd=root, env=environment, stdout=DEVNULL)
+
+        with open(f'{root}/profile.json', 'r', encoding='utf-8') as file:
+            profile: dict = json.load(file)
+
+    total: dict = profile['phases']['total']
+    return {
+        'items': size,
+        'posts': posts,
+        'pages': pages,
+        'pages_per_second': size / total['wall'],
+        'total_wall': total['wall'],
+        'max_rss': total['max_rss'],
+        # ? With --jobs the content is parsed and rendered in worker processes, which max_rss does not include.
+        'max_rss_children': total['max_rss_children'],
+        'phases': {phase: entry['wall'] for phase, entry in profile['phases'].items()},
+    }
+
+
+def print_results(results: list, previous: dict = None) -> None:
+    print(f'{"items":>8} {"pages/s":>10} {"total (s)":>10} {"load (s)":>9} {"render (s)":>10} {"rss (MiB)":>10} '
+          f'{"worker rss (MiB)":>17}')
+    for result in results:
+        phases: dict = result['phases']
+        line: str = f'{result["items"]:>8} {result["pages_per_second"]:>10.1f} {result["total_wall"]:>10.2f} ' \
+                    f'{phases.get("content_load", 0):>9.2f} {phases.get("content_render", 0):>10.2f} ' \
+                    f'{result["max_rss"] / 1024 / 1024:>10.1f} {result["max_rss_children"] / 1024 / 1024:>17.1f}'
+        old: dict = (previous or {}).get(str(result['items']))
+        if old:
+            changes: list = [f'{metric} {(result[metric] - old[metric]) / old[metric]:+.1%}' for metric in METRICS
+                             if old.get(metric)]
+            line += '   vs. previous: ' + ', '.join(changes)
+        print(line)
+
+
+def find_regressions(results: list, previous: dict, threshold: float) -> list:
+    regressions: list = list()
+    for result in results:
+        old: dict = previous.get(str(result['items']))
+        if not old:
+            continue
+        for metric, larger_is_better in METRICS.items():
+            # ? Runs saved before a metric was added (and builds without workers) can't be compared by it.
+            if not old.get(metric):
+                continue
+            change: float = (result[metric] - old[metric]) / old[metric]
+            if (-change if larger_is_better else change) > threshold:
+                regressions.append(f'{result["items"]} items: {metric} changed by {change:+.1%}')
+    return regressions
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='The numbers of items (posts and pages) to build.')
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--pages-ratio', type=float, default=0.05, help='The share of the items that are pages.')
+    parser.add_argument('--paragraphs', type=int, default=8, help='The number of paragraphs in every item.')
+    parser.add_argument('--static-files', type=int, default=0)
+    parser.add_argument('--markdown-cache', action='store_true', help='Measure builds with a warm markdown cache.')
+    parser.add_argument('--save', metavar='FILE', help='Save the results as JSON.')
+    parser.add_argument('--compare', metavar='FILE', help='Compare the results with an earlier saved run.')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='How much worse a metric can get before --compare fails. Default: 0.10')
+    options = parser.parse_args()
+
+    results: list = [run_size(size, options.jobs, options.pages_ratio, options.paragraphs, options.static_files,
+                              options.markdown_cache) for size in options.sizes]
+
+    previous: dict = None
+    if options.compare:
+        with open(options.compare, 'r', encoding='utf-8') as file:
+            previous = {str(result['items']): result for result in json.load(file)['results']}
+
+    print_results(results, previous)
+
+    if options.save:
+        os.makedirs(os.path.dirname(os.path.abspath(options.save)), exist_ok=True)
+        with open(options.save, 'w', encoding='utf-8') as file:
+            json.dump({'date': datetime.now().isoformat(), 'options': vars(options), 'results': results}, file,
+                      indent=2)
+
+    if previous:
+        regressions: list = find_regressions(results, previous, options.threshold)
+        for regression in regressions:
+            print(f'REGRESSION: {regression}')
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
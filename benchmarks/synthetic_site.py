@@ -0,0 +1,120 @@
+"""
+Generates a synthetic site to benchmark RootbeerSSG with.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.synthetic_site /tmp/bench-site --posts 1000 --pages 50
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from random import Random
+import os
+
+from yaml import safe_dump, safe_load
+
+from rootbeerSSG.create_config_file import rb_create_default_config_file
+
+WORDS: list = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et '
+               'dolore magna aliqua rootbeer static site generator blog markdown template python').split()
+
+
+def make_paragraph(random: Random, words: int) -> str:
+    text: list = random.choices(WORDS, k=words)
+    # ? Adds a bit of inline markdown so the parser has something to do.
+    text[random.randrange(words)] = f'**{text[0]}**'
+    text[random.randrange(words)] = f'[{text[1]}](https://example.com/{text[2]})'
+    return ' '.join(text).capitalize() + '.'
+
+
+def make_markdown(random: Random, title: str, date: datetime, content_type: str, paragraphs: int,
+                  extra_metadata: int) -> str:
+    metadata: dict = {
+        'title': title,
+        'date': date.strftime('%m/%d/%y at %H:%M'),
+        'type': content_type,
+        'tags': random.sample(WORDS, 3),
+    }
+    for number in range(extra_metadata):
+        metadata[f'field_{number}'] = random.choice(WORDS)
+
+    body: list = [f'## {title}']
+    for number in range(paragraphs):
+        body.append(make_paragraph(random, random.randint(40, 120)))
+        if number % 4 == 3:
+            body.append('\n'.join(f'- {word}' for word in random.sample(WORDS, 4)))
+    return f'---\n{safe_dump(metadata, sort_keys=False)}---\n' + '\n\n'.join(body) + '\n'
+
+
+def generate_site(root: str, posts: int = 100, pages: int = 10, paragraphs: int = 8, extra_metadata: int = 2,
+                  static_files: int = 0, static_size: int = 64 * 1024, seed: int = 0, **config) -> str:
+    """
+    Generates a synthetic site.
+
+    :param root: The directory to generate the site in. Its config file is ".rbconfig".
+    :param posts: The number of posts.
+    :param pages: The number of pages.
+    :param paragraphs: The number of paragraphs in every post and page.
+    :param extra_metadata: The number of extra metadata fields of every post and page.
+    :param static_files: The number of files in the static directory.
+    :param static_size: The size in bytes of every static file.
+    :param seed: The seed of the random content, so the same arguments always make the same site.
+    :param config: Settings to change in the default config.
+
+    :return: The path of the config file.
+    """
+    random: Random = Random(seed)
+    start: datetime = datetime(2010, 1, 1)
+
+    for directory in ('posts', 'pages', 'static/img'):
+        os.makedirs(f'{root}/content/{directory}', exist_ok=True)
+
+    for number in range(posts):
+        # ? Spreads the posts over a few directories like a real blog.
+        directory: str = f'{root}/content/posts/{number % 20:02}'
+        os.makedirs(directory, exist_ok=True)
+        date: datetime = start + timedelta(minutes=random.randrange(6_000_000))
+        with open(f'{directory}/post-{number}.md', 'w', encoding='utf-8') as file:
+            file.write(make_markdown(random, f'Post {number}', date, 'post', paragraphs, extra_metadata))
+
+    for number in range(pages):
+        date = start + timedelta(minutes=random.randrange(6_000_000))
+        with open(f'{root}/content/pages/page-{number}.md', 'w', encoding='utf-8') as file:
+            file.write(make_markdown(random, f'Page {number}', date, 'page', paragraphs, extra_metadata))
+
+    for number in range(static_files):
+        with open(f'{root}/content/static/img/asset-{number}.bin', 'wb') as file:
+            # ? getrandbits instead of randbytes, which only came in Python 3.9.
+            file.write(random.getrandbits(8 * static_size).to_bytes(static_size, 'little'))
+
+    config_file: str = f'{root}/.rbconfig'
+    if os.path.exists(config_file):
+        os.remove(config_file)
+    rb_create_default_config_file(config_file)
+    with open(config_file, 'r') as file:
+        site_config: dict = safe_load(file)
+    site_config['auto_install_markdown_extentions'] = False
+    site_config.update(config)
+    with open(config_file, 'w') as file:
+        safe_dump(site_config, file, sort_keys=False)
+
+    return config_file
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('root', help='The directory to generate the site in.')
+    parser.add_argument('--posts', type=int, default=100)
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--paragraphs', type=int, default=8, help='The number of paragraphs in every post and page.')
+    parser.add_argument('--extra-metadata', type=int, default=2, help='The number of extra metadata fields.')
+    parser.add_argument('--static-files', type=int, default=0)
+    parser.add_argument('--static-size', type=int, default=64 * 1024, help='The size of every static file in bytes.')
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+
+    generate_site(options.root, options.posts, options.pages, options.paragraphs, options.extra_metadata,
+                  options.static_files, options.static_size, options.seed)
+
+
+if __name__ == '__main__':
+    main()
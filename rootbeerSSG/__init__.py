@@ -4,38 +4,79 @@ from os import path
 from datetime import datetime
 from importlib import import_module
 from urllib.parse import urljoin
-import pathlib
+from math import ceil
+from itertools import chain
+from functools import partial
+from contextlib import ExitStack
+from time import perf_counter
 
 # Module Imports
-from markdown import Markdown
-from jinja2 import Environment, FileSystemLoader, Template, Markup
+from jinja2 import Template
+from markupsafe import Markup
 from slug import slug
-from yaml import safe_load
+from paginate import Page
+from blinker import NamedSignal
 
 # rootbeer Imports
 from .utils import *
 from .errors import *
 from .signals import *
-from .create_config_file import rb_create_default_config_file
-from .create_default_theme import rb_create_default_theme
+from .manifest import RBBuildManifest
+from .cache import RBMarkdownCache
+from .filters import RBMarkdownFilter
+from .parsing import RBLazyMarkdown, rb_parse_markdown_files, rb_resolve_jobs
+from .rendering import rb_render_items
+from .output import RBOutputWriter
+from .store import RBContentStore, RBLazyContent
+from .content import RBContent
+from .profiler import RBBuildProfiler
+from .assets import RBStaticSync
+from .images import RBImageProcessor, rb_remove_image_variants
+from .feeds import (feed_files, rb_write_atom_feed, rb_write_json_feed, rb_write_rss_feed, rb_write_sitemap,
+                    sitemap_max_urls)
+from .search import RBSearchIndex
+from .taxonomy import RBTaxonomy, RBTerm
+from .deploy import RBDeployManifest
+from .urls import RBUrlIndex, rb_check_links, rb_content_slug
+from .hooks import RBBackgroundHooks
+from .templates import RBEnvironment, rb_build_filter, rb_create_environment, rb_precompile_templates
+from .site import RBSite
 
 
 class RootbeerSSG:
-    def __init__(self, config_file: str = '.rbconfig') -> None:
+    def __init__(self, config_file: str = '.rbconfig', jobs: int = None, incremental: bool = None,
+                 profile: bool = False, profile_file: str = None, profile_memory: bool = True,
+                 build: bool = True, site: RBSite = None) -> None:
         """
         The class that genrates all the site's data and renders everything. The core or the module.
 
         :param config_file: The config file for your site. Uses YAML syntax. Does not have to be a .rbconfig file.
             Default: .rbconfig
+        :param jobs: The number of processes used to parse and render the content. Overrides the "jobs" setting in the
+            config file. 0 or less uses one process per CPU core.
+            Default: None
+        :param incremental: Whether to only re-render what changed since the last build. Overrides the
+            "incremental_builds" setting in the config file.
+            Default: None
+        :param profile: Whether to measure how long every phase, file, template and plugin takes and print a report.
+            Default: False
+        :param profile_file: A JSON file to also save the profile report to.
+            Default: None
+        :param profile_memory: Whether the profile measures the peak memory of every phase with tracemalloc, which
+            makes the build slower.
+            Default: True
+        :param build: Whether to build the site right away. If not, call build() when you want to.
+            Default: True
+        :param site: The RBSite to use instead of making one from the config file.
+            Default: None
 
         :return: None
         """
 
-        rb_create_default_config_file(config_file)
-
         # ===== READ CONFIG =====
-        with open(config_file, 'r') as config_f:
-            self.config = safe_load(config_f.read())
+        # ? Only creates what is missing (the config file, the directories and the default theme).
+        self.rb_site: RBSite = (site or RBSite(config_file)).init()
+        self.config = self.rb_site.config
 
         # ! Make a plugin that allow un-pretty permalinks so the date_format and pretty_permalinks params can be
         # ! Optional and make it so they are stated in a config file for the plugin to un-clutter the main class.
@@ -47,24 +88,6 @@ class RootbeerSSG:
             # This makes sure that the yaml markdown extentions is installed at all times.
             markdown_extentions = {'markdown-full-yaml-metadata': 'full_yaml_metadata'}
 
-        list_of_files_to_gen: list = [
-            'plugins',
-            self.config['content_directory'],
-            'themes',
-            f'{self.config["content_directory"]}/static',
-            f'{self.config["content_directory"]}/pages',
-            f'{self.config["content_directory"]}/posts',
-        ]
-
-        for file in list_of_files_to_gen:
-            rb_create_path_if_does_not_exist(file)
-
-        with open('plugins/__init__.py', 'w') as plugins_main:
-            plugins_main.write('# :) hi')
-
-        if not path.exists(f'{self.config["themes_dir"]}/RBDefault'):
-            rb_create_default_theme(self.config['themes_dir'])
-
         # ===== GLOBAL VARIABLES =====
         self.site_title: str = self.config['site_title']
         self.pretty_p: bool = self.config['pretty_permalinks_on_posts']
@@ -76,6 +99,11 @@ class RootbeerSSG:
         self.themes_dir: str = self.config['themes_dir']
         self.date_format: str = self.config['date_format_for_content']
         self.site_url: str = self.config['url']
+        self.items_per_page: int = self.config.get('pagination_items_per_page', 10)
+        if not isinstance(self.items_per_page, int) or self.items_per_page < 1:
+            raise RBConfigError(f'pagination_items_per_page has to be a whole number of at least 1, not '
+                                f'"{self.items_per_page}".')
+        self.pagination_format: str = self.config.get('pagination_format', '$link_previous ~2~ $link_next')
 
         self.sort_pages: str = self.config['sort_pages_by']
         self.sort_pages_reversed: bool = self.config['sort_pages_reverse']
@@ -89,29 +117,89 @@ class RootbeerSSG:
         self.content_types: list = ['post', 'page']
 
         # ===== VARIABLES =====
-        list_of_extentions_for_markdown: list = list()
+        self.md_extention_names: list = list()
         search_path: str = f'{self.themes_dir}/{self.theme}'
 
-        if self.config['auto_install_markdown_extentions']:
-            rb_install_markdown_extras_modules(self.config['markdown_extentions'].keys())
+        # ? Only checks if the extentions can be imported. pip is only run for the ones that can't.
+        missing_extentions: dict = rb_find_missing_markdown_extensions(self.md_extentions)
+        if missing_extentions:
+            if not self.config['auto_install_markdown_extentions']:
+                raise RBMissingOptionalDependency(
+                    f'The markdown extentions {", ".join(missing_extentions.values())} are not installed. Install '
+                    f'them or turn on auto_install_markdown_extentions.')
+            rb_install_markdown_extras_modules([name for name in missing_extentions if name])
 
         # ===== PREPROCESSORS =====
         for ext in self.md_extentions:
             # Appends the import word into the list
-            list_of_extentions_for_markdown.append(self.md_extentions[ext])
+            self.md_extention_names.append(self.md_extentions[ext])
 
         # ===== INSTANCES =====
-        # ? Creates a new object with the full_yaml_metadata extention already activated.
-        self.md: Markdown = Markdown(extensions=list_of_extentions_for_markdown)
-        self.env: Environment = Environment(loader=FileSystemLoader(searchpath=search_path))
-        self.env.lstrip_blocks = True
-        self.env.trim_blocks = True
+        self.cache_dir: str = self.config.get('cache_directory', '.rbcache')
+        self.md_cache: RBMarkdownCache = None
+        if self.config.get('markdown_cache', True):
+            self.md_cache = RBMarkdownCache(f'{self.cache_dir}/markdown.sqlite', self.md_extention_names,
+                                            self.config.get('markdown_cache_size', 256) * 1024 * 1024)
+
+        # ? Creates a new object with the full_yaml_metadata extention already activated. It is only really made (and
+        # ? the extentions only loaded) when a file has to be parsed.
+        self.md: RBLazyMarkdown = RBLazyMarkdown(self.md_extention_names)
+        self.mdify: RBMarkdownFilter = RBMarkdownFilter(self.md_extention_names, self.md_cache,
+                                                        self.config.get('mdify_memo_size', 1024))
+        # ? Compiled templates are stored in the cache directory so the next build (or process) doesn't compile them.
+        self.autoescape = self.config.get('autoescape', False)
+        self.env: RBEnvironment = rb_create_environment(
+            search_path, f'{self.cache_dir}/templates' if self.config.get('template_bytecode_cache', True) else None,
+            self.autoescape)
 
         # ===== JINJA2 FILTERS =====
-        self.env.filters['mdify'] = lambda text: Markup(self.md.convert(text))
-        self.env.filters['abs_url'] = lambda url: self._rb_return_absolute_url(url)
+        # ? Filters that depend on the build (or on the config, like the markdown extentions of mdify) must not be run
+        # ? on constants when templates are compiled. See rb_build_filter.
+        self.env.filters['mdify'] = rb_build_filter(self.mdify.__call__)
+        self.env.filters['abs_url'] = rb_build_filter(self._rb_return_absolute_url)
         self.env.filters['slugify'] = lambda text: slug(text)
+        self.env.filters['asset'] = rb_build_filter(lambda file: self.static_sync.asset_map.get(file.lstrip('/'), file))
+        self.env.filters['srcset'] = rb_build_filter(self._rb_srcset)
+        self.env.filters['resized'] = rb_build_filter(self._rb_resized)
+        self.env.filters['ref'] = rb_build_filter(self._rb_ref)
+        self.env.globals['ref'] = self.env.filters['ref']
 
+        # ===== OPTIONAL VARIABLES =====
+        self.md_ext: str = self.config['markdown_file_extention']
+        self.incremental: bool = self.config.get('incremental_builds', False) if incremental is None else incremental
+        self.streaming: bool = self.config.get('streaming_build', False)
+        self.image_variants: dict = self.config.get('image_variants') or None
+        self.sitemap: bool = self.config.get('sitemap', False)
+        self.feeds: list = self.config.get('feeds') or list()
+        # ? Checked here so a wrong feed type fails the build before anything is rendered.
+        if not isinstance(self.feeds, list):
+            raise RBConfigError(f'feeds has to be a list of feed types, like [rss, atom], not "{self.feeds}".')
+        for feed_type in self.feeds:
+            if feed_type not in feed_files:
+                raise RBConfigError(f'"{feed_type}" is not a feed type. Use rss, atom or json.')
+        self.feed_items: int = self.config.get('feed_items', 20)
+        self.feed_full_content: bool = self.config.get('feed_full_content', True)
+        self.search_index: bool = self.config.get('search_index', False)
+        self.taxonomy_names: list = self.config.get('taxonomies') or list()
+        self.minify_html: bool = self.config.get('minify_html', False)
+        self.compress_output: list = self.config.get('compress_output') or list()
+        self.deploy_manifest: str = self.config.get('deploy_manifest') or None
+        self.check_links: bool = self.config.get('check_links', False)
+        self.profile: bool = profile
+        self.profile_file: str = profile_file
+        self.profile_memory: bool = profile_memory
+        self.jobs: int = rb_resolve_jobs(jobs if jobs is not None else self.config.get('jobs', 1))
+
+        if build:
+            self.build()
+
+    def _rb_load_plugins(self) -> None:
+        """
+        Imports the plugins. They are only imported when the site is built, so making a RootbeerSSG object just to
+        look at it or to precompile its templates doesn't run them.
+
+        :return: None
+        """
         # ===== PLUGIN LOADING =====
         if 'plugins' in self.config:
             list_of_plugins = [plugin for plugin in self.config['plugins']]
@@ -119,50 +207,225 @@ class RootbeerSSG:
             for plugin in list_of_plugins:
                 import_module(f'plugins.{plugin}')
 
-        # ===== OPTIONAL VARIABLES =====
-        self.md_ext: str = self.config['markdown_file_extention']
+    def precompile_templates(self) -> list:
+        """
+        Compiles every template of the theme into the template bytecode cache, so the next build starts faster. Useful
+        right after installing or changing a theme.
+
+        :return: The names of the compiled templates.
+        """
+        return rb_precompile_templates(self.env)
+
+    def build(self) -> None:
+        """
+        Loads all the content and renders the site into the output directory.
+
+        The output directory is not wiped. Every file the build makes is recorded in the build manifest, files the
+        previous build made that this one didn't are deleted and files whose contents did not change are not written
+        again, so they keep their mtimes. When incremental builds are turned on, content whose source file and
+        templates did not change since the last build is not even rendered, and the index and archive pages are only
+        re-rendered when the posts or their templates changed.
+
+        When streaming builds are turned on, the HTML of every item is moved to a temporary content store as soon as
+        it is loaded. Items only hold a lazy stand-in for it that reads it back when a template outputs it, so the
+        bodies of all the content are never in memory at the same time. The store is deleted when the build ends.
 
+        :return: None
+        """
+        self._rb_load_plugins()
+
+        self.content = list()
+        self.taxonomies: dict = {name: RBTaxonomy(name, f'{self.blog_dir}/{name}') for name in self.taxonomy_names}
+        self.manifest: RBBuildManifest = RBBuildManifest(f'{self.cache_dir}/manifest.json')
+        self._rb_source_hashes: dict = dict()
+        self._rb_template_hashes: dict = dict()
+        self._rb_item_dependencies: dict = dict()
+        self.env.reset_stats()
+        # ? Runs the batch hooks of plugins that asked to run in the background. See hooks.py.
+        self.background: RBBackgroundHooks = RBBackgroundHooks()
+        # ? Every page, listing and feed is written through this, so they all get minified, compressed and skipped when
+        # ? they did not change.
+        self.writer: RBOutputWriter = RBOutputWriter(max_workers=max(4, self.jobs), minify=self.minify_html,
+                                                     compression=self.compress_output)
+        self.content_store: RBContentStore = RBContentStore(self.cache_dir) if self.streaming else None
+
+        try:
+            self._rb_run_build()
+        finally:
+            # ? Also closed when the build fails, so serve (which builds again after every failure) doesn't leave
+            # ? content stores, writer threads and cache connections behind.
+            self._rb_close_build()
+
+    def _rb_run_build(self) -> None:
+        """
+        Runs the phases of a build. See build.
+
+        :return: None
+        """
         # ===== FUNCTION CALLS =====
-        rb_create_and_or_clean_path(self.out_dir)
+        # ? A different config can change every url and page so it has to be a full rebuild.
+        self._rb_full_rebuild: bool = not self.manifest.set_config_hash(rb_hash_config(self.config)) or \
+            not self.incremental
+        if self.manifest.previous['config'] is None and not self.incremental:
+            # ? Without the manifest of the previous build there is no telling which files in the output directory are
+            # ? stale, so it starts over like it did before builds kept it.
+            rb_create_and_or_clean_path(self.out_dir)
+        else:
+            rb_create_path_if_does_not_exist(self.out_dir)
+
+        self.profiler: RBBuildProfiler = None
+        if self.profile:
+            self.profiler = RBBuildProfiler(trace_memory=self.profile_memory)
+            self.profiler.start(self)
 
         print(f'Generating Site. . .')
 
-        after_content_load.send(self)
+        self._rb_send(before_content_load)
 
         self._rb_load_site_content()
 
-        before_content_load.send(self)
+        self._rb_send(after_content_load)
+
+        if self.content_store is not None:
+            self.content_store.flush()
+
+        # ? Sent after the flush so batch hooks of streaming builds can read the content back.
+        self._rb_send(content_loaded, items=self.content)
+
+        # Syncs the static files before rendering so templates can look up their (hashed) names.
+        self.static_sync: RBStaticSync = RBStaticSync(f'{self.cont_dir}/static', self.out_dir,
+                                                      f'{self.cache_dir}/static.json', max(4, self.jobs),
+                                                      self.config.get('static_hardlinks', False),
+                                                      self.config.get('hash_static_file_names', False))
+        self.static_sync.sync()
+        # ? Recorded so assets.json is deleted when hashed file names are turned off.
+        self.manifest.record_listing('assets', '', [f'{self.out_dir}/assets.json'] if self.static_sync.hash_file_names
+                                     else [])
+        if self.static_sync.hash_file_names and (self.static_sync.copied or self.static_sync.removed):
+            # ? The hashed names changed, so every page that links to them has to be rendered again.
+            self._rb_full_rebuild = True
+
+        # ? Background hooks of the loaded content run while the static files are synced. They can change the items,
+        # ? so they have to finish before the items are sorted, indexed and rendered. They are waited for before the
+        # ? images, because forking the image processes while the hooks' threads hold locks can deadlock them.
+        self.background.wait()
+
+        # Makes the resized variants of the images for the "srcset" and "resized" Jinja2 filters.
+        self.images: RBImageProcessor = None
+        if self.image_variants:
+            self.images = RBImageProcessor(self.static_sync, f'{self.cache_dir}/images',
+                                           self.image_variants.get('widths', [480, 960, 1440]),
+                                           self.image_variants.get('formats', ['original']),
+                                           self.image_variants.get('quality', 80), self.jobs)
+            self.images.process()
+            if self.images.changed:
+                # ? Pages with srcsets of the images have to list the new variants.
+                self._rb_full_rebuild = True
+        else:
+            rb_remove_image_variants(f'{self.cache_dir}/images', self.out_dir)
 
         # ===== CONTENT SORTING =====
         self.pages: list = list()
         self.posts: list = list()
         for cont in self.content:
-            if cont['metadata']['type'] == 'page':
+            if cont.type == 'page':
                 self.pages.append(cont)
-            elif cont['metadata']['type'] == 'post':
+            elif cont.type == 'post':
                 self.posts.append(cont)
 
-        before_content_render.send(self)
+        self.pages = rb_sort_content(self.pages, self.sort_pages, self.sort_pages_reversed)
+        self.posts = rb_sort_content(self.posts, self.sort_posts, self.sort_posts_reversed)
+        for taxonomy in self.taxonomies.values():
+            taxonomy.sort_items(self.posts)
+
+        self._rb_build_url_index()
+
+        if self.search_index:
+            self._rb_build_search_index()
+
+        self._rb_send(before_content_render)
 
         self._rb_render_all_content_types()
 
-        after_content_render.send(self)
+        self._rb_send(after_content_render)
 
-        before_render_index.send(self)
+        self._rb_send(before_render_index)
 
         self._rb_render_index_page()
 
-        after_render_index.send(self)
+        self._rb_send(after_render_index)
 
-        before_render_archive.send(self)
+        self._rb_send(before_render_archive)
 
         self._rb_render_post_archive_page()
 
-        after_render_archive.send(self)
+        self._rb_send(after_render_archive)
+
+        self._rb_send(before_render_taxonomies)
+
+        self._rb_render_taxonomy_pages()
+
+        self._rb_send(after_render_taxonomies)
+
+        self._rb_send(before_render_feeds)
+
+        self._rb_render_feeds()
+
+        self._rb_send(after_render_feeds)
+
+        self._rb_close_build()
+
+        for stale_output in self.manifest.stale_outputs():
+            rb_remove_output_file(stale_output, self.out_dir)
+        self.manifest.save()
+
+        # ? Checked after the stale outputs are deleted, so links to removed or moved content are found right away.
+        if self.check_links:
+            self._rb_check_links()
+
+        # ? Made after everything is written and the stale outputs are deleted, so it lists what is really there.
+        self.deploy: RBDeployManifest = None
+        if self.deploy_manifest:
+            self.deploy = RBDeployManifest(self.deploy_manifest, self.out_dir, max(4, self.jobs))
+            summary: dict = self.deploy.update()
+            print(f'Deploy manifest: {summary["added"]} added, {summary["changed"]} changed, {summary["removed"]} '
+                  f'removed and {summary["unchanged"]} unchanged files. See "{self.deploy_manifest}".')
 
         # ===== SITE GEN FINISHED =====
         print(f'Site generation complete! Your static files can be found in "{self.out_dir}/".')
 
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler.stats['mdify'] = self.mdify.stats()
+            self.profiler.stats['templates'] = self.env.stats()
+            self.profiler.stats['output'] = {'written': self.writer.written, 'unchanged': self.writer.unchanged}
+            if self.deploy is not None:
+                self.profiler.stats['deploy'] = self.deploy.summary
+            if self.md_cache is not None:
+                # ? Counted from the files because the lookups happen in the worker processes when jobs > 1.
+                hits: int = sum(1 for entry in self.profiler.files.values() if entry.get('cached'))
+                self.profiler.stats['markdown_cache'] = {'hits': hits, 'misses': len(self.profiler.files) - hits}
+            self.profiler.print_report()
+            if self.profile_file:
+                self.profiler.save(self.profile_file)
+
+    def _rb_close_build(self) -> None:
+        """
+        Waits for the background hooks and the queued writes and closes the markdown cache and the content store. It
+        can be called more than once.
+
+        :return: None
+        """
+        # ? An ExitStack so everything is still closed when one of them raises. It closes them from the last to the
+        # ? first, so the hooks are waited for before the writes and the writes before the cache and the store.
+        with ExitStack() as stack:
+            if self.content_store is not None:
+                stack.callback(self.content_store.close)
+            if self.md_cache is not None:
+                stack.callback(self.md_cache.close)
+            stack.callback(self.writer.close)
+            stack.callback(self.background.close)
+
     def _rb_load_site_content(self) -> None:
         """
         Loads the site's content
@@ -172,156 +435,495 @@ class RootbeerSSG:
         # Creates the directory that contains the markdown if it does not exist already.
         rb_create_path_if_does_not_exist(self.cont_dir)
 
-        # Cycles through all the files in any folders in the contetn directory.
-        for file in glob(f'{self.cont_dir}/**/*.{self.md_ext}', recursive=True):
-            with open(file, 'r', encoding='utf-8') as content_file:
-                # Parses the content and saves it to a variable.
-                parsed_content: str = self.md.convert(content_file.read())
+        # Gets all the files in any folders in the content directory. They are sorted so the content always gets
+        # loaded in the same order.
+        files: list = sorted(glob(f'{self.cont_dir}/**/*.{self.md_ext}', recursive=True))
+
+        # Cycles through all the parsed files. When more than one job is used, the files are parsed in worker
+        # processes but everything below still happens here so the signals get sent in order.
+        parsed_files = rb_parse_markdown_files(files, self.md, self.md_extention_names, self.jobs, self.md_cache)
+        for file, source_hash, parsed_content, metadata, cached, parse_time in parsed_files:
+            if self.profiler is not None:
+                self.profiler.record_parse(file, parse_time, cached)
 
-            self.item: dict = dict()
-            # ? Assigns the file name to the item
-            self.item['file_name'] = content_file.name
+            # ? Kept for incremental builds and the search index.
+            self._rb_source_hashes[file] = (source_hash, path.getmtime(file) if self.incremental else None)
 
             # Checks to see if the metadata is required.
             if self.required_metadata_fields:
                 # Checks to see if the content has metadata.
-                if self.md.Meta:
+                if metadata:
                     # Cycles through each of the required fields.
                     for field in self.required_metadata_fields:
                         # Checks to see if the field is in the metadata or not.
-                        if field not in self.md.Meta:
+                        if field not in metadata:
                             raise RBContentMetadataMissingRequiredField(
-                                f'The file, "{content_file.name}", is missing the'
+                                f'The file, "{file}", is missing the'
                                 f' required metadata: {field}.')
-                        else:
-                            # ? If all checks pass then assign the metadata to the item.
-                            self.item['metadata'] = self.md.Meta
                 else:
                     # If there is no metadata when it is required, throw and error.
-                    raise RBContentMissingMetadata(f'The file, "{content_file.name}", does not contain any metadata.')
-
-            during_content_load.send(self)
-
-            self.item['date'] = self.md.Meta['date']
-            date: datetime = datetime.strptime(self.item['date'], self.date_format)
-            self.item['date'] = date
-            self.item['readable_date'] = date.strftime(self.date_format.replace('%H:%M', '%I:%M %p'))
-
-            # Gets the content's slug
-            item_path: str = path.splitext(path.relpath(content_file.name))[0]
-            paths_to_remove: list = [f'{self.cont_dir}']
-            for ct in self.content_types:
-                # Addes the content types plural to the list of paths.
-                # EX: content/pages
-                paths_to_remove.append(f'{ct}s')
-            final_path_list: list = [word for word in item_path.split('\\') if word not in paths_to_remove]
-            self.item['slug'] = slug('/'.join(final_path_list))
-
-            blog_out_dir = self.out_dir + '/' + self.blog_dir
-
-            # Creates the content's url
-            if self.item['metadata']['type'] == 'post':
-                if self.pretty_p:
-                    self.item['content_path_url'] = f'{blog_out_dir}/{self.item["slug"]}'
-                    self.item['url'] = f'{self.blog_dir}/{self.item["slug"]}'
-                else:
-                    self.item[
-                        'content_path_url'] = f'{blog_out_dir}/{self.item["date"].year}/' \
-                                              f'{self.item["date"].month:0>2}/{self.item["date"].day:0>2}/' \
-                                              f'{self.item["slug"]}'
-                    self.item['url'] = f'{self.blog_dir}/{self.item["date"].year}/' \
-                                       f'{self.item["date"].month:0>2}/{self.item["date"].day:0>2}/{self.item["slug"]}'
-
-            if self.item['metadata']['type'] == 'page':
-                if self.pretty_p_pages:
-                    self.item['content_path_url'] = f'{self.out_dir}/{self.item["slug"]}'
-                    self.item['url'] = f'{self.item["slug"]}'
-                else:
-                    self.item[
-                        'content_path_url'] = f'{self.out_dir}/{self.item["date"].year}/' \
-                                              f'{self.item["date"].month:0>2}/' \
-                                              f'{self.item["date"].day:0>2}/{self.item["slug"]}'
-                    self.item['url'] = f'{self.item["date"].year}/{self.item["date"].month:0>2}/' \
-                                       f'{self.item["date"].day:0>2}/{self.item["slug"]}'
-            # ? Finally, add the parsed content to the item.
-            self.item['content'] = parsed_content
+                    raise RBContentMissingMetadata(f'The file, "{file}", does not contain any metadata.')
+
+            # ? If all checks pass then make the item.
+            self.item: RBContent = RBContent(self, file, metadata or dict())
+
+            self._rb_send(during_content_load)
+
+            self.item.date = datetime.strptime(self.item.metadata['date'], self.date_format)
+
+            # Gets the content's slug from its path, without the content directory and the directory of its type.
+            # EX: content/posts/2021/hello.md -> 2021/hello
+            self.item.slug = rb_content_slug(file, self.cont_dir, self.content_types)
+
+            # ? The readable date and the urls are worked out by the item when they are first used.
+
+            # A short summary for listing pages. The "summary" metadata field is used if there is one, otherwise it is
+            # the first paragraph of the content.
+            self.item.summary = self.item.metadata.get('summary') or rb_first_paragraph(parsed_content)
+            if self.autoescape and 'summary' not in self.item.metadata:
+                self.item.summary = Markup(self.item.summary)
+
+            # ? Finally, add the parsed content to the item. Streaming builds move it to the content store instead.
+            if self.content_store is not None:
+                self.content_store.put(file, parsed_content)
+                self.item.content = RBLazyContent(self.content_store, file)
+            elif self.autoescape:
+                # ? The content is already HTML, so it must not be escaped again.
+                self.item.content = Markup(parsed_content)
+            else:
+                self.item.content = parsed_content
 
             # Append it to the list of content.
             self.content.append(self.item)
 
-            sort_content_types: dict = dict()
-            sort_content_types['page'] = dict()
-            sort_content_types['post'] = dict()
-            sort_content_types['page']['sort_by'] = self.sort_pages
-            sort_content_types['page']['sort_reversed'] = self.sort_pages_reversed
-            sort_content_types['post']['sort_by'] = self.sort_posts
-            sort_content_types['post']['sort_reversed'] = self.sort_posts_reversed
-
-            for content_type in self.content_types:
-                self.content.sort(key=lambda x: sort_content_types[content_type]['sort_by'],
-                                  reverse=sort_content_types[content_type]['sort_reversed'])
+            # Adds posts to the taxonomies (like tags) in their metadata.
+            if self.item.type == 'post':
+                for taxonomy in self.taxonomies.values():
+                    taxonomy.add(self.item)
 
     def _rb_render_all_content_types(self) -> None:
         """
         Renders all the content types.
 
+        The during_content_render signal is sent for every item right before it is rendered. When more than one job
+        is used the items are rendered in worker processes, so the signal is sent for all of them (in order) before
+        the workers start. The pages are written on the output writer's threads.
+
         :return: None
         """
-        for item in self.content:
-            template: Template = self.env.get_template(f'{item["metadata"]["type"]}.html')
-            content_path = item['content_path_url']
+        indexes_to_render: list = list()
+        for index, item in enumerate(self.content):
+            template_name: str = f'{item.type}.html'
+            content_path = item.content_path_url
+
+            # ? Recorded on every build so the outputs of removed content can be deleted.
+            source_hash, mtime = self._rb_source_hashes[item.file_name]
+            templates: dict = self._rb_hash_item_template(template_name)
+            outputs: list = self._rb_with_siblings([f'{content_path}/index.html'])
+            self.manifest.record_item(item.file_name, source_hash, mtime, templates, outputs)
+            if not self._rb_full_rebuild and \
+                    self.manifest.is_item_unchanged(item.file_name, source_hash, templates, outputs):
+                continue
+
+            indexes_to_render.append(index)
+
+        def before_render(item) -> None:
+            self.item = item
+            self._rb_send(during_content_render)
+
+        for index, (output_file, html, render_time) in zip(
+                indexes_to_render, rb_render_items(self, indexes_to_render, self.jobs, before_render)):
+            if self.profiler is not None:
+                self.profiler.record_render(self.content[index].file_name, f'{self.content[index].type}.html',
+                                            render_time)
+            self.writer.write(output_file, html)
+
+        self._rb_send(content_rendered, items=[self.content[index] for index in indexes_to_render])
 
-            during_content_render.send(self)
+    def _rb_render_index_page(self) -> None:
+        """
+        Renders the index page. It only gets the first page of posts, the rest can be found in the archive.
 
-            pathlib.Path(content_path).mkdir(parents=True, exist_ok=True)
-            with open(f'{content_path}/index.html', 'w', encoding='utf-8') as file:
-                file.write(
-                    template.render(
-                        rootbeer=self,
-                        this=item,
-                        config=self.config,
-                    )
-                )
+        :return: None
+        """
+        if self._rb_skip_listing('index', 'index.html', [f'{self.out_dir}/index.html']):
+            return
 
-        rb_copy_static_files_to_public_directory(self.cont_dir, self.out_dir)
+        template: Template = self.env.get_template('index.html')
+        self.pagination = self._rb_paginate_posts(1)
+        self._rb_send(during_render_index)
+
+        self.writer.write(
+            f'{self.out_dir}/index.html',
+            self._rb_render_listing(
+                template,
+                posts=self.pagination.items,
+                pages=self.pages,
+                pagination=self.pagination,
+                config=self.config,
+                rootbeer=self
+            )
+        )
 
-    def _rb_render_index_page(self) -> None:
+    def _rb_render_post_archive_page(self) -> None:
         """
-        Renders the index page.
+        Renders the archive. Every page of posts is rendered on its own, the first one to "archive/index.html" and
+        the others to "archive/page-N/index.html".
 
         :return: None
         """
-        template: Template = self.env.get_template('index.html')
-        with open(f'{self.out_dir}/index.html', 'w', encoding='utf-8') as index_file:
-            during_render_index.send(self)
+        page_count: int = self._rb_page_count(len(self.posts))
+        outputs: list = [self._rb_archive_page_path(page) for page in range(1, page_count + 1)]
+        if self._rb_skip_listing('archive', 'archive.html', outputs):
+            return
 
-            index_file.write(
-                template.render(
-                    posts=self.posts,
-                    pages=self.pages,
+        template: Template = self.env.get_template('archive.html')
+        for page, output in enumerate(outputs, start=1):
+            self.pagination = self._rb_paginate_posts(page)
+            self._rb_send(during_render_archive)
+
+            self.writer.write(
+                output,
+                self._rb_render_listing(
+                    template,
+                    posts=self.pagination.items,
+                    pagination=self.pagination,
                     config=self.config,
                     rootbeer=self
                 )
             )
 
-        # pprint(self.pagination.link_map(self.config['pagination_format'],
-        #                                 url=f'{self.config["url"]}/{self.blog_dir}/archive/page-$page'))
+    def _rb_render_taxonomy_pages(self) -> None:
+        """
+        Renders the pages of every term of every taxonomy, like "blog/tags/python/index.html". They are paginated like
+        the archive. Themes without a "taxonomy.html" template get them rendered with "archive.html".
 
-    def _rb_render_post_archive_page(self) -> None:
-        template: Template = self.env.get_template('archive.html')
-        # for page in range(self.pagination.page_count):
-        #     page += 1
-        rb_create_path_if_does_not_exist(f'{self.out_dir}/{self.blog_dir}/archive/')
-        with open(f'{self.out_dir}/{self.blog_dir}/archive/index.html', 'w', encoding='utf-8') as archive:
-            during_render_archive.send(self)
-
-            archive.write(
-                template.render(
-                    posts=self.posts,
-                    config=self.config,
-                    rootbeer=self
+        :return: None
+        """
+        if not self.taxonomies:
+            return
+
+        template_name: str = 'taxonomy.html' if 'taxonomy.html' in self.env.list_templates() else 'archive.html'
+        template: Template = None
+        for taxonomy in self.taxonomies.values():
+            for term in taxonomy.values():
+                page_count: int = self._rb_page_count(len(term.items))
+                outputs: list = [f'{self.out_dir}/{taxonomy.page_url(term, page)}index.html'
+                                 for page in range(1, page_count + 1)]
+                if self._rb_skip_listing(f'{taxonomy.name}/{term.slug}', template_name, outputs, term.items):
+                    continue
+
+                template = template or self.env.get_template(template_name)
+                self.term: RBTerm = term
+                for page, output in enumerate(outputs, start=1):
+                    self.pagination = self._rb_paginate(term.items, page, partial(taxonomy.page_url, term))
+                    self._rb_send(during_render_taxonomy)
+
+                    self.writer.write(
+                        output,
+                        self._rb_render_listing(
+                            template,
+                            posts=self.pagination.items,
+                            pagination=self.pagination,
+                            taxonomy=taxonomy,
+                            term=term,
+                            config=self.config,
+                            rootbeer=self
+                        )
+                    )
+
+    def _rb_build_url_index(self) -> None:
+        """
+        Builds the index of the content by source file, slug and url that the ref filter looks items up in, and checks
+        that nothing is rendered to the same file as something else.
+
+        :return: None
+        """
+        self.urls: RBUrlIndex = RBUrlIndex(self.cont_dir)
+        self.urls.reserve([f'{self.out_dir}/index.html'], 'the index page')
+        page_count: int = self._rb_page_count(len(self.posts))
+        self.urls.reserve([self._rb_archive_page_path(page) for page in range(1, page_count + 1)], 'the archive')
+        for taxonomy in self.taxonomies.values():
+            for term in taxonomy.values():
+                term_pages: int = self._rb_page_count(len(term.items))
+                self.urls.reserve([f'{self.out_dir}/{taxonomy.page_url(term, page)}index.html'
+                                   for page in range(1, term_pages + 1)], f'the {taxonomy.name} page of "{term.name}"')
+        self.urls.add(self.content)
+        # ? Items whose templates use the ref filter depend on this. See _rb_hash_item_template.
+        self.urls_hash: str = rb_hash_config({item.file_name: item.url for item in self.content})
+
+    def _rb_check_links(self) -> None:
+        """
+        Checks the internal links of every page in the output directory and prints the ones that are broken.
+
+        :return: None
+        """
+        broken: list = rb_check_links(self.out_dir, self.site_url, self.jobs)
+        for page, link in broken:
+            print(f'Broken link in "{page}": {link}')
+        if broken:
+            print(f'Found {len(broken)} broken links.')
+        if self.profiler is not None:
+            self.profiler.stats['links'] = {'broken': len(broken)}
+
+    def _rb_build_search_index(self) -> None:
+        """
+        Builds the client-side search index of the content. Only new and changed items are indexed again.
+
+        :return: None
+        """
+        search_index: RBSearchIndex = RBSearchIndex(self.out_dir, f'{self.cache_dir}/search',
+                                                    self.config.get('search_shard_prefix', 2),
+                                                    self.config.get('search_metadata_fields'), self.jobs, self.writer)
+        search_index.build(self.content, {file: hashes[0] for file, hashes in self._rb_source_hashes.items()},
+                           self._rb_return_absolute_url)
+
+        # ? Recorded so the index is deleted if it gets turned off.
+        self.manifest.record_listing('search', '', self._rb_with_siblings(search_index.outputs()))
+        if self.profiler is not None:
+            self.profiler.stats['search_index'] = {'indexed': search_index.indexed,
+                                                   'shards_written': len(search_index.written)}
+
+    def _rb_render_feeds(self) -> None:
+        """
+        Writes the sitemap and the feeds that are turned on. They are written straight from the urls, dates and
+        content the items already have, without any templates, and only when the content they list changed.
+
+        :return: None
+        """
+        if self.sitemap:
+            page_count: int = self._rb_page_count(len(self.posts))
+            term_pages: list = [(taxonomy, term, page) for taxonomy in self.taxonomies.values()
+                                for term in taxonomy.values()
+                                for page in range(1, self._rb_page_count(len(term.items)) + 1)]
+            url_count: int = 1 + page_count + len(term_pages) + len(self.content)
+            sitemaps: list = [f'{self.out_dir}/sitemap.xml']
+            if url_count > sitemap_max_urls:
+                sitemaps = [f'{self.out_dir}/sitemap-{number}.xml'
+                            for number in range(1, ceil(url_count / sitemap_max_urls) + 1)] + sitemaps
+
+            if not self._rb_skip_listing('sitemap', None, sitemaps):
+                urls = chain(
+                    [(self._rb_return_absolute_url(''), None)],
+                    ((self._rb_return_absolute_url(self._rb_archive_page_url(page)), None)
+                     for page in range(1, page_count + 1)),
+                    ((self._rb_return_absolute_url(taxonomy.page_url(term, page)), None)
+                     for taxonomy, term, page in term_pages),
+                    ((self._rb_return_absolute_url(f'{item.url}/'), item.date) for item in self.pages + self.posts),
                 )
-            )
+                rb_write_sitemap(self.out_dir, self.site_url, urls, writer=self.writer)
+
+        if not self.feeds:
+            return
+
+        # ? Feeds always have the newest posts first, no matter how the posts are sorted on the site.
+        feed_posts: list = rb_sort_content(self.posts, 'date', True)[:self.feed_items]
+        outputs: list = [f'{self.out_dir}/{feed_files[feed_type]}' for feed_type in self.feeds]
+        if self._rb_skip_listing('feeds', None, outputs, feed_posts):
+            return
+
+        feed: dict = {
+            'title': self.site_title,
+            'link': self._rb_return_absolute_url(''),
+            'description': self.config.get('site_description') or self.site_title,
+            'author': self.config.get('author') or self.site_title,
+        }
+        feed_writers: dict = {'rss': rb_write_rss_feed, 'atom': rb_write_atom_feed, 'json': rb_write_json_feed}
+        for feed_type in self.feeds:
+            file_name: str = feed_files[feed_type]
+            write_feed = feed_writers[feed_type]
+            feed['feed_url'] = self._rb_return_absolute_url(file_name)
+            # ? A generator, so streaming builds only read one post's content at a time.
+            entries = ((post.metadata.get('title', post.slug), self._rb_return_absolute_url(f'{post.url}/'),
+                        post.date, str(post.content if self.feed_full_content else post.summary))
+                       for post in feed_posts)
+            write_feed(f'{self.out_dir}/{file_name}', feed, entries, self.writer)
+
+    def _rb_paginate_posts(self, page: int) -> Page:
+        """
+        Gets one page of posts.
+
+        :param page: The number of the page, starting at 1.
+
+        :return: The page. Its links point to the pages of the archive.
+        """
+        return self._rb_paginate(self.posts, page, self._rb_archive_page_url)
+
+    def _rb_page_count(self, item_count: int) -> int:
+        """
+        Gets the number of pages a listing of items is split into. A listing without items still gets one page.
+
+        :param item_count: The number of items.
+
+        :return: The number of pages.
+        """
+        return max(1, ceil(item_count / self.items_per_page))
+
+    def _rb_paginate(self, items: list, page: int, url_maker) -> Page:
+        """
+        Gets one page of a list of items.
+
+        :param items: The items.
+        :param page: The number of the page, starting at 1.
+        :param url_maker: A function that gets the url of a page from its number, relative to the site's url.
+
+        :return: The page.
+        """
+        return Page(items, page=page, items_per_page=self.items_per_page,
+                    url_maker=lambda number: self._rb_return_absolute_url(url_maker(number)))
+
+    def _rb_archive_page_url(self, page: int) -> str:
+        if page == 1:
+            return f'{self.blog_dir}/archive/'
+        return f'{self.blog_dir}/archive/page-{page}/'
+
+    def _rb_archive_page_path(self, page: int) -> str:
+        return f'{self.out_dir}/{self._rb_archive_page_url(page)}index.html'
+
+    def _rb_send(self, signal: NamedSignal, **kwargs) -> None:
+        """
+        Sends a signal to the plugins. When the build is profiled, the time spent in every receiver is recorded.
+
+        :param signal: The signal to send.
+        :param kwargs: The data sent with the signal, like the items of a batch signal.
+
+        :return: None
+        """
+        if self.profiler is not None:
+            self.profiler.send(signal, self, **kwargs)
+        else:
+            signal.send(self, **kwargs)
+
+    def _rb_render_listing(self, template: Template, **context) -> str:
+        """
+        Renders a listing page, like the index or a page of the archive.
+
+        :param template: The template of the listing.
+        :param context: The variables the template gets.
+
+        :return: The rendered HTML.
+        """
+        if self.profiler is None:
+            return template.render(**context)
+
+        start: float = perf_counter()
+        html: str = template.render(**context)
+        self.profiler.record_template(template.name, perf_counter() - start)
+        return html
+
+    def _rb_hash_template(self, template_name: str) -> dict:
+        """
+        Hashes a template and everything it depends on. Each template only gets hashed once per build.
+
+        :param template_name: The name of the template.
+
+        :return: A dict of the names of the templates and their hashes.
+        """
+        if template_name not in self._rb_template_hashes:
+            self._rb_template_hashes[template_name] = rb_hash_template(self.env, template_name)
+        return self._rb_template_hashes[template_name]
+
+    def _rb_hash_item_template(self, template_name: str) -> dict:
+        """
+        Hashes the template of a content type like _rb_hash_template does, and adds the hashes of the site-wide data
+        the template uses, so items rendered with it are rendered again when that data changes: the urls of all the
+        content for templates that use the ref filter, and all the content for templates that list it (like a menu of
+        rootbeer.pages or the newest of rootbeer.posts).
+
+        :param template_name: The name of the template.
+
+        :return: A dict of the names of the templates and the site-wide data and their hashes.
+        """
+        if template_name not in self._rb_item_dependencies:
+            dependencies: dict = dict(self._rb_hash_template(template_name))
+            uses: set = rb_find_site_uses(self.env, list(dependencies))
+            if uses & {'ref', 'urls', 'rootbeer'}:
+                dependencies['#urls'] = self.urls_hash
+            if uses & {'posts', 'pages', 'content', 'taxonomies', 'rootbeer'}:
+                # ? Same as what the listing pages depend on, in the order the posts and pages are listed.
+                dependencies['#content'] = rb_hash_config(
+                    [(item.file_name, self._rb_source_hashes[item.file_name][0]) for item in self.pages + self.posts])
+            self._rb_item_dependencies[template_name] = dependencies
+        return self._rb_item_dependencies[template_name]
+
+    def _rb_skip_listing(self, name: str, template_name: str, outputs: list, items: list = None) -> bool:
+        """
+        Records a listing page in the build manifest and checks if it can be skipped. Listing pages only depend on
+        their templates and the content they list, so they can be skipped when neither of them changed.
+
+        :param name: The name of the listing.
+        :param template_name: The template the listing is rendered with, or None if it doesn't use one.
+        :param outputs: The files the listing produces.
+        :param items: The content the listing depends on, in the order it lists it.
+            Default: all the content
+
+        :return: True if the listing does not have to be rendered again.
+        """
+        listing: dict = {
+            'templates': self._rb_hash_template(template_name) if template_name else dict(),
+            'content': [(item.file_name, self._rb_source_hashes[item.file_name][0])
+                        for item in (self.content if items is None else items)],
+        }
+        listing_hash: str = rb_hash_config(listing)
+        self.manifest.record_listing(name, listing_hash, self._rb_with_siblings(outputs))
+
+        return not self._rb_full_rebuild and self.manifest.is_listing_unchanged(name, listing_hash)
+
+    def _rb_with_siblings(self, outputs: list) -> list:
+        """
+        Adds the compressed siblings the output writer makes to a list of outputs, so they are recorded in the build
+        manifest too and get deleted with their files (or when compression is turned off).
+
+        :param outputs: The files.
+
+        :return: The files and their siblings.
+        """
+        return outputs + [sibling for output in outputs for sibling in self.writer.siblings(output)]
+
+    def _rb_ref(self, key: str) -> str:
+        """
+        Gets the url of a post or page from its source file, url or slug. See RBUrlIndex.
+
+        :param key: The source file, url or slug.
+
+        :return: The absolute url of the item.
+        """
+        return self._rb_return_absolute_url(f'{self.urls[key].url}/')
 
     def _rb_return_absolute_url(self, rel_url: str) -> str:
         return urljoin(self.site_url, rel_url)
+
+    def _rb_srcset(self, file: str, image_format: str = None) -> str:
+        """
+        Makes the srcset attribute of an image, like "https://example.com/img/photo.480w.jpg 480w, ...".
+
+        :param file: The name of the image in the static directory.
+        :param image_format: The format of the variants, like "webp". None is the format of the image.
+            Default: None
+
+        :return: The srcset. Without image variants (or when the image could not be read) it is just the url of the
+            image.
+        """
+        if self.images is None or file.lstrip('/') in self.images.failed:
+            return self._rb_return_absolute_url(self.static_sync.asset_map.get(file.lstrip('/'), file))
+        return ', '.join(f'{self._rb_return_absolute_url(name)} {width}w'
+                         for name, width in self.images.srcset(file, image_format))
+
+    def _rb_resized(self, file: str, width: int, image_format: str = 'original') -> str:
+        """
+        Gets the url of one variant of an image.
+
+        :param file: The name of the image in the static directory.
+        :param width: The width of the variant.
+        :param image_format: The format of the variant, like "webp".
+            Default: original
+
+        :return: The url of the variant, or the url of the image if there is no such variant.
+        """
+        file = file.lstrip('/')
+        if self.images is not None:
+            extension: str = path.splitext(file)[1].lower() if image_format == 'original' else f'.{image_format}'
+            for variant, variant_width in self.images.variants.get(file, []):
+                if variant_width == width and variant.endswith(extension):
+                    return self._rb_return_absolute_url(variant)
+        return self._rb_return_absolute_url(self.static_sync.asset_map.get(file, file))
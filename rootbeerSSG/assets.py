@@ -0,0 +1,187 @@
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+import json
+import os
+import shutil
+
+from .utils import rb_remove_output_file
+
+try:
+    from fcntl import ioctl
+except ImportError:
+    # ? fcntl is not available on Windows, so files are never reflinked there.
+    ioctl = None
+
+# The ioctl that makes a copy-on-write clone of a file on Linux filesystems that support it (like btrfs and xfs).
+FICLONE: int = 0x40049409
+
+
+def rb_hash_file(file: str) -> str:
+    """
+    Hashes the contents of a file without reading all of it into memory.
+
+    :param file: The file to hash.
+
+    :return: The hex digest of the file.
+    """
+    digest = sha256()
+    with open(file, 'rb') as opened_file:
+        for chunk in iter(lambda: opened_file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def rb_hashed_file_name(file: str, file_hash: str) -> str:
+    """
+    Adds the start of a file's hash to its name, like "img/logo.png" -> "img/logo.3f2a9c1b.png".
+
+    :param file: The file name.
+    :param file_hash: The hash of the file.
+
+    :return: The hashed file name.
+    """
+    root, extension = os.path.splitext(file)
+    return f'{root}.{file_hash[:8]}{extension}'
+
+
+def rb_link_or_copy_file(source: str, destination: str, hardlink: bool = False) -> None:
+    """
+    Puts a copy of a file somewhere as cheaply as the filesystem allows. It tries, in order, a hardlink (if allowed),
+    a copy-on-write reflink and a normal copy.
+
+    :param source: The file to copy.
+    :param destination: Where to put the copy.
+    :param hardlink: Whether a hardlink may be used. A hardlinked file is the same file as the source, so changing it
+        in the output directory also changes the source.
+        Default: False
+
+    :return: None
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    if os.path.lexists(destination):
+        os.remove(destination)
+
+    if hardlink:
+        try:
+            os.link(source, destination)
+            return
+        except OSError:
+            pass
+
+    if ioctl is not None:
+        try:
+            with open(source, 'rb') as source_file, open(destination, 'wb') as destination_file:
+                ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+            shutil.copystat(source, destination)
+            return
+        except OSError:
+            pass
+
+    shutil.copy2(source, destination)
+
+
+class RBStaticSync:
+    """
+    Syncs the static directory into the output directory.
+
+    Every synced file is recorded in a manifest with its size, modification time and hash. On the next sync, files
+    whose size and modification time did not change are not even read, files whose contents did not change are not
+    copied again and the outputs of files that were removed are deleted. Files that do have to be copied are copied
+    on a pool of threads.
+
+    Files can also be given content-hashed names (like "img/logo.3f2a9c1b.png") so they can be cached forever. The
+    asset_map links the original names to the hashed ones and is what the "asset" Jinja2 filter looks names up in.
+    """
+
+    def __init__(self, static_dir: str, out_dir: str, manifest_file: str, jobs: int = 4, hardlink: bool = False,
+                 hash_file_names: bool = False) -> None:
+        """
+        :param static_dir: The directory with the static files.
+        :param out_dir: The output directory.
+        :param manifest_file: The JSON file the manifest is stored in.
+        :param jobs: The number of threads that copy files.
+            Default: 4
+        :param hardlink: Whether the files may be hardlinked instead of copied. See rb_link_or_copy_file.
+            Default: False
+        :param hash_file_names: Whether to add the hashes of the files to their names.
+            Default: False
+
+        :return: None
+        """
+        self.static_dir: str = static_dir
+        self.out_dir: str = out_dir
+        self.manifest_file: str = manifest_file
+        self.jobs: int = jobs
+        self.hardlink: bool = hardlink
+        self.hash_file_names: bool = hash_file_names
+
+        self.asset_map: dict = dict()
+        self.file_hashes: dict = dict()
+        self.copied: list = list()
+        self.removed: list = list()
+
+        self.previous: dict = dict()
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r', encoding='utf-8') as file:
+                try:
+                    self.previous = json.load(file)
+                except ValueError:
+                    self.previous = dict()
+
+    def sync(self) -> dict:
+        """
+        Syncs the static files.
+
+        :return: The asset map.
+        """
+        files: list = list()
+        for directory, _, names in os.walk(self.static_dir):
+            for name in names:
+                files.append(os.path.relpath(os.path.join(directory, name), self.static_dir).replace(os.sep, '/'))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            current: dict = dict(zip(files, executor.map(self._rb_sync_file, files)))
+
+        current_outputs: set = {entry['output'] for entry in current.values()}
+        for file, entry in self.previous.items():
+            if entry['output'] not in current_outputs:
+                rb_remove_output_file(f'{self.out_dir}/{entry["output"]}', self.out_dir)
+                self.removed.append(entry['output'])
+
+        self.copied = [entry['output'] for entry in current.values() if entry.pop('copied')]
+        self.asset_map = {file: entry['output'] for file, entry in current.items()}
+        self.file_hashes = {file: entry['hash'] for file, entry in current.items()}
+
+        manifest_dir: str = os.path.dirname(self.manifest_file)
+        if manifest_dir:
+            os.makedirs(manifest_dir, exist_ok=True)
+        with open(self.manifest_file, 'w', encoding='utf-8') as file:
+            json.dump(current, file, indent=2)
+
+        if self.hash_file_names:
+            with open(f'{self.out_dir}/assets.json', 'w', encoding='utf-8') as file:
+                json.dump(self.asset_map, file, indent=2)
+
+        return self.asset_map
+
+    def _rb_sync_file(self, file: str) -> dict:
+        source: str = f'{self.static_dir}/{file}'
+        stat: os.stat_result = os.stat(source)
+        previous: dict = self.previous.get(file)
+
+        if previous is not None and previous['size'] == stat.st_size and previous['mtime'] == stat.st_mtime:
+            # ? Same size and modification time, so the file is trusted to be the same without reading it.
+            file_hash: str = previous['hash']
+        else:
+            file_hash = rb_hash_file(source)
+
+        output: str = rb_hashed_file_name(file, file_hash) if self.hash_file_names else file
+        entry: dict = {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': file_hash, 'output': output}
+
+        unchanged: bool = previous is not None and previous['hash'] == file_hash and previous['output'] == output
+        if unchanged and os.path.exists(f'{self.out_dir}/{output}'):
+            entry['copied'] = False
+        else:
+            rb_link_or_copy_file(source, f'{self.out_dir}/{output}', self.hardlink)
+            entry['copied'] = True
+        return entry
@@ -0,0 +1,179 @@
+from time import time
+import os
+import pickle
+import sqlite3
+import zlib
+
+import markdown
+
+from .utils import rb_hash_text
+
+
+class RBMarkdownCache:
+    """
+    A persistent cache of parsed markdown, stored in a single SQLite file.
+
+    Entries are keyed by the hash of the markdown source together with the markdown extentions and the version of the
+    Markdown library, so changing either of them never returns stale HTML. Every entry holds the compressed HTML and
+    metadata. When the cache grows past its size limit, the least recently used entries are evicted.
+
+    Every process that uses the cache (like the workers that parse and render the content) opens its own connection.
+    New entries and hits are kept in memory and written in batches.
+    """
+    batch_size: int = 256
+
+    def __init__(self, cache_file: str, extensions: list, max_size: int = 256 * 1024 * 1024) -> None:
+        """
+        :param cache_file: The SQLite file the cache is stored in.
+        :param extensions: The import names of the markdown extentions the content is parsed with.
+        :param max_size: The size in bytes the entries of the cache are evicted down to.
+            Default: 256 MiB
+
+        :return: None
+        """
+        self.cache_file: str = cache_file
+        self.max_size: int = max_size
+        self.key_prefix: str = f'{markdown.__version__}|{"|".join(extensions)}|'
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._rb_pid: int = -1
+        self._rb_db: sqlite3.Connection = None
+        self._rb_pending: dict = dict()
+        self._rb_used: dict = dict()
+
+    def __getstate__(self) -> dict:
+        # ? Connections can't be sent to other processes. They open their own.
+        state: dict = self.__dict__.copy()
+        state.update(_rb_pid=-1, _rb_db=None, _rb_pending=dict(), _rb_used=dict())
+        return state
+
+    def _rb_connection(self) -> sqlite3.Connection:
+        if self._rb_pid != os.getpid():
+            cache_dir: str = os.path.dirname(self.cache_file)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+
+            self._rb_db = sqlite3.connect(self.cache_file, timeout=30)
+            self._rb_db.execute('PRAGMA journal_mode=WAL')
+            self._rb_db.execute('CREATE TABLE IF NOT EXISTS markdown '
+                                '(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, '
+                                'last_used REAL NOT NULL)')
+            self._rb_pid = os.getpid()
+            self._rb_pending = dict()
+            self._rb_used = dict()
+        return self._rb_db
+
+    def key(self, source_hash: str) -> str:
+        """
+        Makes the cache key of a markdown source.
+
+        :param source_hash: The hash of the markdown source. See rb_hash_text.
+
+        :return: The cache key.
+        """
+        return rb_hash_text(self.key_prefix + source_hash)
+
+    def get(self, key: str):
+        """
+        Looks up parsed markdown.
+
+        :param key: The cache key. See key().
+
+        :return: A tuple of the HTML and the metadata or None if the markdown is not cached.
+        """
+        if key in self._rb_pending:
+            self.hits += 1
+            return pickle.loads(zlib.decompress(self._rb_pending[key]))
+
+        row: tuple = self._rb_connection().execute('SELECT value FROM markdown WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return pickle.loads(zlib.decompress(row[0]))
+
+    def touch(self, key: str) -> None:
+        """
+        Marks an entry as used so it is evicted last.
+
+        :param key: The cache key.
+
+        :return: None
+        """
+        self._rb_connection()
+        self._rb_used[key] = time()
+        if len(self._rb_used) >= self.batch_size:
+            self.flush()
+
+    def put(self, key: str, html: str, metadata) -> None:
+        """
+        Adds parsed markdown to the cache.
+
+        :param key: The cache key. See key().
+        :param html: The parsed HTML.
+        :param metadata: The metadata of the markdown.
+
+        :return: None
+        """
+        self._rb_connection()
+        self._rb_pending[key] = zlib.compress(pickle.dumps((html, metadata), protocol=pickle.HIGHEST_PROTOCOL))
+        if len(self._rb_pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the new entries and the hits to the cache file.
+
+        :return: None
+        """
+        if not self._rb_pending and not self._rb_used:
+            return
+
+        now: float = time()
+        with self._rb_connection() as db:
+            db.executemany('INSERT OR REPLACE INTO markdown (key, value, size, last_used) VALUES (?, ?, ?, ?)',
+                           [(key, value, len(value), now) for key, value in self._rb_pending.items()])
+            db.executemany('UPDATE markdown SET last_used = ? WHERE key = ?',
+                           [(last_used, key) for key, last_used in self._rb_used.items()])
+        self._rb_pending.clear()
+        self._rb_used.clear()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits in its size limit.
+
+        :return: None
+        """
+        db: sqlite3.Connection = self._rb_connection()
+        total_size: int = db.execute('SELECT COALESCE(SUM(size), 0) FROM markdown').fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        keys_to_remove: list = list()
+        for key, size in db.execute('SELECT key, size FROM markdown ORDER BY last_used'):
+            if total_size <= self.max_size:
+                break
+            keys_to_remove.append((key,))
+            total_size -= size
+
+        with db:
+            db.executemany('DELETE FROM markdown WHERE key = ?', keys_to_remove)
+        db.execute('VACUUM')
+
+    def close(self) -> None:
+        """
+        Writes everything that is left to the cache file, evicts old entries and closes the connection.
+
+        :return: None
+        """
+        if self._rb_db is None or self._rb_pid != os.getpid():
+            return
+
+        self.flush()
+        self.evict()
+        self._rb_db.close()
+        self._rb_db = None
+        self._rb_pid = -1
@@ -0,0 +1,83 @@
+from argparse import ArgumentParser, Namespace
+from sys import argv
+
+from . import RootbeerSSG
+from .site import RBSite
+
+commands: tuple = ('build', 'serve', 'precompile', 'init')
+
+
+def rb_parse_args(args: list) -> Namespace:
+    """
+    Parses the command line arguments. If no command is given, "build" is used.
+
+    :param args: The arguments to parse.
+
+    :return: The parsed arguments.
+    """
+    if not args or args[0] not in commands + ('-h', '--help'):
+        args = ['build', *args]
+
+    parser: ArgumentParser = ArgumentParser(prog='rootbeer', description='Generates your static site.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser: ArgumentParser = subparsers.add_parser('build', help='Build the site. This is the default.')
+    serve_parser: ArgumentParser = subparsers.add_parser(
+        'serve', help='Build the site, serve it locally and rebuild it when something changes.')
+    precompile_parser: ArgumentParser = subparsers.add_parser(
+        'precompile', help="Compile the theme's templates into the template cache without building the site.")
+    init_parser: ArgumentParser = subparsers.add_parser(
+        'init', help='Create the config file, the directories and the default theme of a new site.')
+
+    for command_parser in (build_parser, serve_parser, precompile_parser, init_parser):
+        command_parser.add_argument('-c', '--config', default='.rbconfig',
+                                    help='The config file for your site. Default: .rbconfig')
+
+    for command_parser in (build_parser, serve_parser):
+        command_parser.add_argument('-j', '--jobs', type=int, default=None,
+                                    help='The number of processes used to parse and render the content. 0 uses '
+                                         'one per CPU core. Overrides the "jobs" setting in the config file.')
+
+    build_parser.add_argument('--profile', action='store_true',
+                              help='Print how long every phase, file, template and plugin took.')
+    build_parser.add_argument('--profile-json', default=None, metavar='FILE',
+                              help='Also save the profile report to a JSON file. Implies --profile.')
+    build_parser.add_argument('--profile-without-tracemalloc', action='store_true',
+                              help="Don't measure the peak memory of every phase, which slows the build down.")
+
+    serve_parser.add_argument('--host', default='localhost', help='The host to serve the site on. Default: localhost')
+    serve_parser.add_argument('-p', '--port', type=int, default=8000,
+                              help='The port to serve the site on. Default: 8000')
+
+    return parser.parse_args(args)
+
+
+def main(args: list = None) -> None:
+    """
+    The entry point of the rootbeer command.
+
+    :param args: The command line arguments. Uses the ones the program was started with if None.
+        Default: None
+
+    :return: None
+    """
+    if args is None:
+        args = argv[1:]
+
+    options: Namespace = rb_parse_args(args)
+
+    if options.command == 'init':
+        RBSite(options.config).init()
+        print(f'Your site is ready! Change "{options.config}" and start writing.')
+    elif options.command == 'precompile':
+        site: RootbeerSSG = RootbeerSSG(config_file=options.config, build=False)
+        print(f'Compiled {len(site.precompile_templates())} templates into "{site.cache_dir}/templates/".')
+    elif options.command == 'serve':
+        # ? Only imported when serving because the HTTP server modules slow down starting every other command.
+        from .server import RBDevServer
+
+        RBDevServer(options.config, host=options.host, port=options.port, jobs=options.jobs).serve_forever()
+    else:
+        RootbeerSSG(config_file=options.config, jobs=options.jobs,
+                    profile=options.profile or options.profile_json is not None, profile_file=options.profile_json,
+                    profile_memory=not options.profile_without_tracemalloc)
@@ -0,0 +1,116 @@
+from datetime import datetime
+
+
+class RBContent:
+    """
+    A loaded post or page.
+
+    The fields are stored in slots instead of a dict, which makes every item a lot smaller and makes attribute lookups
+    in templates (like "post.url" or "this.metadata.title") fast. The readable date and the urls are only worked out
+    the first time they are used.
+
+    Items can still be used like the dicts they used to be (item['url'], item['metadata']), and plugins can add their
+    own fields with item['field'] = value. Those can be read in templates like any other field.
+    """
+    __slots__ = ('site', 'file_name', 'metadata', 'date', 'slug', 'summary', 'content', 'extra',
+                 '_rb_readable_date', '_rb_path')
+
+    def __init__(self, site, file_name: str, metadata: dict) -> None:
+        """
+        :param site: The RootbeerSSG object the item belongs to. Its settings are used to work out the urls.
+        :param file_name: The markdown file the item was loaded from.
+        :param metadata: The metadata of the item.
+
+        :return: None
+        """
+        self.site = site
+        self.file_name: str = file_name
+        self.metadata: dict = metadata
+        self.date: datetime = None
+        self.slug: str = None
+        self.summary: str = None
+        self.content = None
+        self.extra: dict = None
+
+        self._rb_readable_date: str = None
+        self._rb_path: str = None
+
+    @property
+    def type(self) -> str:
+        return self.metadata['type']
+
+    @type.setter
+    def type(self, value: str) -> None:
+        self.metadata['type'] = value
+
+    @property
+    def readable_date(self) -> str:
+        if self._rb_readable_date is None:
+            self._rb_readable_date = self.date.strftime(self.site.date_format.replace('%H:%M', '%I:%M %p'))
+        return self._rb_readable_date
+
+    @readable_date.setter
+    def readable_date(self, value: str) -> None:
+        self._rb_readable_date = value
+
+    @property
+    def url(self) -> str:
+        """
+        The url of the item, relative to the site's url.
+        """
+        if self._rb_path is None:
+            self._rb_path = self._rb_make_path()
+        return self._rb_path
+
+    @url.setter
+    def url(self, value: str) -> None:
+        self._rb_path = value
+
+    @property
+    def content_path_url(self) -> str:
+        """
+        The directory in the output directory the item is rendered to.
+        """
+        return f'{self.site.out_dir}/{self.url}'
+
+    def _rb_make_path(self) -> str:
+        if self.type == 'post':
+            prefix: str = f'{self.site.blog_dir}/'
+            pretty: bool = self.site.pretty_p
+        else:
+            prefix = ''
+            pretty = self.site.pretty_p_pages
+
+        if pretty:
+            return f'{prefix}{self.slug}'
+        return f'{prefix}{self.date.year}/{self.date.month:0>2}/{self.date.day:0>2}/{self.slug}'
+
+    def __getattr__(self, name: str):
+        # ? Only called for names that aren't slots or properties, so this is where fields added by plugins are found.
+        extra: dict = object.__getattribute__(self, 'extra')
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value) -> None:
+        if key in self.__slots__ or isinstance(getattr(type(self), key, None), property):
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = dict()
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self) -> str:
+        return f'<RBContent {self.file_name!r}>'
@@ -34,6 +34,99 @@ blog_directory: blog
 themes_dir: themes
 theme_name: RBDefault
 
+# The number of posts on the index page and on every page of the archive.
+pagination_items_per_page: 10
+# How the page links look. See the "pager" method of paginate.Page for the format.
+pagination_format: "$link_previous ~2~ $link_next"
+
+# The metadata fields that are taxonomies, like tags or categories. Every term gets its own paginated page of posts
+# (like blog/tags/python/) rendered with the theme's taxonomy.html (or archive.html if it doesn't have one).
+# Templates can get the posts of a term straight away: {{ rootbeer.taxonomies.tags['python'].items }}
+taxonomies: [tags, categories]
+
+# The output directory is kept between builds: files that did not change are not written again and files that are
+# no longer made are deleted. Incremental builds also only re-render the content that changed since the last build.
+# The data needed for this is stored in the cache directory.
+incremental_builds: false
+cache_directory: .rbcache
+
+# Streaming builds keep the HTML of the content in a temporary file in the cache directory instead of in memory and
+# only read it back when a template uses it. Turn this on for very large sites.
+streaming_build: false
+
+# Static files are only copied when they changed. Hardlinking them is the fastest, but then the files in the output
+# directory are the same files as in the static directory, so changing one changes the other.
+static_hardlinks: false
+# Adds the hash of every static file to its name (like img/logo.3f2a9c1b.png) so browsers can cache them forever.
+# Use the asset filter to get the hashed name in templates: {{ 'img/logo.png' | asset | abs_url }}
+hash_static_file_names: false
+
+# Makes smaller variants of the images (jpg, png and webp) in the static directory, so pages can use srcset.
+# Needs Pillow: pip install rootbeerSSG[images]. Variants are cached, so images are only resized when they change.
+# Use the srcset and resized filters in templates:
+# <img src="{{ 'img/photo.jpg' | asset | abs_url }}" srcset="{{ 'img/photo.jpg' | srcset }}">
+# <source type="image/webp" srcset="{{ 'img/photo.jpg' | srcset('webp') }}">
+# {{ 'img/photo.jpg' | resized(480) }}
+# image_variants:
+#   widths: [480, 960, 1440]
+#   formats: [original, webp]
+#   quality: 80
+
+# Parsed markdown is cached in the cache directory so unchanged files don't have to be parsed again.
+# The cache is kept under markdown_cache_size megabytes by removing the entries that were used the longest time ago.
+markdown_cache: true
+markdown_cache_size: 256
+
+# Compiled templates are stored in the cache directory, so templates are only compiled again when they change.
+# Run "rootbeer precompile" after installing or changing a theme to compile all of them ahead of time.
+template_bytecode_cache: true
+# Escapes the variables templates output. Content and the mdify filter are already HTML and are never escaped.
+# Can also be a list of the template extensions to escape in, like [html, xml].
+autoescape: false
+
+# Writes sitemap.xml. Sites with more than 50,000 urls get more sitemaps (sitemap-1.xml, ...) and a sitemap.xml
+# that lists them.
+sitemap: true
+# The list of feeds to write: rss (feed.xml), atom (atom.xml) and json (feed.json). Use [] for none.
+feeds: [rss, atom, json]
+# The number of newest posts in the feeds and whether they have the whole post or just its summary.
+feed_items: 20
+feed_full_content: true
+# Shown in the feeds. Both default to the site title.
+# site_description: My cool blog
+# author: Me
+
+# Builds a search index of the content into search/ in the output directory. Add search/search.js to your theme to
+# query it: RootbeerSearch('/search/').search('some words').then(function (results) { ... });
+search_index: false
+# The metadata fields that are searched besides the title and the content.
+search_metadata_fields: [tags, categories, summary]
+# The index is split into files by the first characters of the words, so a search only downloads what it needs.
+search_shard_prefix: 2
+
+# Minifies the HTML pages as they are written (comments and extra whitespace are removed).
+minify_html: false
+# Writes compressed copies of the pages, feeds and search index next to them (index.html.gz, index.html.br) so a CDN
+# or web server can send them without compressing them. Use [gzip], [gzip, brotli] or [] for none.
+# brotli needs Brotli: pip install rootbeerSSG[brotli]
+compress_output: []
+
+# Writes a JSON file that lists every file in the output directory with its size, hash and whether it was added,
+# changed, removed or unchanged since the previous build, so a deploy only has to upload what changed.
+# deploy_manifest: .rbcache/deploy.json
+
+# Checks that every link in the pages to another page or file of the site goes somewhere, and prints the ones that
+# don't. Use the ref filter to link to posts and pages by their source file, url or slug so they never break:
+# <a href="{{ 'posts/hello.md' | ref }}">Hello</a>
+check_links: false
+
+# The number of results the mdify filter remembers, so text that is mdified on every page is only parsed once.
+mdify_memo_size: 1024
+
+# The number of processes used to parse and render the content. 0 uses one process per CPU core.
+# Can also be set with "rootbeer --jobs N".
+jobs: 1
+
 # The file extentions for your markdown files. DO NOT HAVE A . AT THE FRONT
 markdown_file_extention: md
 
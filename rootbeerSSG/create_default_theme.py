@@ -13,6 +13,26 @@ archive_html_content: str = '''
         <br>
         <br>
     {% endfor %}
+    {{ pagination.pager(rootbeer.pagination_format) | safe }}
+</body>
+</html>
+'''
+
+taxonomy_html_content: str = '''
+<!doctype html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>{{ term.name }}</title>
+</head>
+<body>
+    <h1>{{ term.name }}</h1>
+    {% for post in posts %}
+        <h3>{{ post.metadata.title }}</h3>
+        <br>
+        <br>
+    {% endfor %}
+    {{ pagination.pager(rootbeer.pagination_format) | safe }}
 </body>
 </html>
 '''
@@ -30,6 +50,7 @@ index_html_content: str = '''
             <h1>{{ post.metadata.title }}</h1>
             {{ post.content }}
         {% endfor %}
+        {{ pagination.pager(rootbeer.pagination_format) | safe }}
     </body>
 </html>
 '''
@@ -68,6 +89,8 @@ def rb_create_default_theme(theme_dir: str) -> None:
         i_file.write(index_html_content)
     with open(theme_dir + '/RBDefault/archive.html', 'w') as i_file:
         i_file.write(archive_html_content)
+    with open(theme_dir + '/RBDefault/taxonomy.html', 'w') as i_file:
+        i_file.write(taxonomy_html_content)
     with open(theme_dir + '/RBDefault/page.html', 'w') as i_file:
         i_file.write(page_html_content)
     with open(theme_dir + '/RBDefault/post.html', 'w') as i_file:
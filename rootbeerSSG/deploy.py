@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+
+from .assets import rb_hash_file
+
+# The statuses a file can have in the deploy manifest.
+deploy_statuses: tuple = ('added', 'changed', 'removed', 'unchanged')
+
+
+class RBDeployManifest:
+    """
+    Lists every file in the output directory with its size, hash and what happened to it since the previous build:
+    added, changed, removed or unchanged. Deploy tools can read it to only upload the files that were added or
+    changed and to delete the ones that were removed, instead of uploading the whole output directory every time.
+
+    It covers everything in the output directory: the pages, the listing pages, the feeds, the search index and the
+    static files. Files are compared by their hashes, so it works the same when the output directory was wiped.
+
+    The manifest is saved as JSON and has this layout:
+
+    {
+        "version": 1,
+        "summary": {"added": 1, "changed": 0, "removed": 0, "unchanged": 0},
+        "files": [
+            {"path": "<file, relative to the output directory>", "size": <size in bytes>, "hash": "<sha256>",
+             "status": "added", "mtime": <modification time>}
+        ]
+    }
+    """
+    version: int = 1
+
+    def __init__(self, manifest_file: str, out_dir: str, jobs: int = 4) -> None:
+        """
+        :param manifest_file: The JSON file the manifest is saved to. The manifest that is already there is the one of
+            the previous build.
+        :param out_dir: The output directory.
+        :param jobs: The number of threads that hash files.
+            Default: 4
+
+        :return: None
+        """
+        self.manifest_file: str = manifest_file
+        self.out_dir: str = out_dir
+        self.jobs: int = jobs
+
+        self.files: list = list()
+        self.summary: dict = {status: 0 for status in deploy_statuses}
+
+        self.previous: dict = dict()
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r', encoding='utf-8') as file:
+                try:
+                    previous: dict = json.load(file)
+                except ValueError:
+                    # ? Without the previous manifest every file is just "added".
+                    previous = dict()
+            if previous.get('version') == self.version:
+                self.previous = {entry['path']: entry for entry in previous['files'] if entry['status'] != 'removed'}
+
+    def update(self) -> dict:
+        """
+        Compares the output directory with the previous build and saves the manifest.
+
+        :return: The number of files with every status.
+        """
+        manifest_path: str = os.path.abspath(self.manifest_file)
+        files: list = list()
+        for directory, _, names in os.walk(self.out_dir):
+            for name in names:
+                file: str = os.path.join(directory, name)
+                if os.path.abspath(file) != manifest_path:
+                    files.append(os.path.relpath(file, self.out_dir).replace(os.sep, '/'))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            entries: list = list(executor.map(self._rb_file_entry, files))
+
+        paths: set = set(files)
+        entries.extend({**entry, 'status': 'removed'} for file, entry in self.previous.items() if file not in paths)
+
+        self.files = sorted(entries, key=lambda entry: entry['path'])
+        self.summary = {status: 0 for status in deploy_statuses}
+        for entry in self.files:
+            self.summary[entry['status']] += 1
+
+        manifest_dir: str = os.path.dirname(self.manifest_file)
+        if manifest_dir:
+            os.makedirs(manifest_dir, exist_ok=True)
+        with open(self.manifest_file, 'w', encoding='utf-8') as file:
+            json.dump({'version': self.version, 'summary': self.summary, 'files': self.files}, file, indent=2)
+
+        return self.summary
+
+    def _rb_file_entry(self, file: str) -> dict:
+        stat: os.stat_result = os.stat(f'{self.out_dir}/{file}')
+        previous: dict = self.previous.get(file)
+
+        if previous is not None and previous['size'] == stat.st_size and previous['mtime'] == stat.st_mtime:
+            # ? The output writer and the static sync leave unchanged files alone, so most files are never read.
+            file_hash: str = previous['hash']
+        else:
+            file_hash = rb_hash_file(f'{self.out_dir}/{file}')
+
+        if previous is None:
+            status: str = 'added'
+        elif previous['hash'] != file_hash:
+            status = 'changed'
+        else:
+            status = 'unchanged'
+        return {'path': file, 'size': stat.st_size, 'hash': file_hash, 'status': status, 'mtime': stat.st_mtime}
@@ -11,4 +11,32 @@ class RBContentMissingMetadata(Exception):
     Gets thrown if the content is missing metadata. Will only be thrown if the file does not have any metadata and if
     there are any items in the list of required metadata fields when initilizing a new rootbeer object.
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class RBMissingOptionalDependency(Exception):
+    """
+    Gets thrown if a feature that is turned on in the config needs a package that is not installed.
+    """
+    pass
+
+
+class RBConfigError(Exception):
+    """
+    Gets thrown if a setting in the config file has a value that can't be used.
+    """
+    pass
+
+
+class RBDuplicateOutputError(Exception):
+    """
+    Gets thrown if two posts or pages (or a post or page and a listing page) would be rendered to the same file.
+    """
+    pass
+
+
+class RBReferenceError(Exception):
+    """
+    Gets thrown if the ref filter is given a source file, url or slug that no post or page has.
+    """
+    pass
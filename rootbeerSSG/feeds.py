@@ -0,0 +1,221 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from itertools import chain, islice
+from typing import Iterable, Iterator
+from xml.sax.saxutils import XMLGenerator
+import json
+import os
+
+# The most urls one sitemap may have. Bigger sites get more sitemaps and a sitemap index that lists them.
+sitemap_max_urls: int = 50000
+
+# The feed types and the files they are written to.
+feed_files: dict = {'rss': 'feed.xml', 'atom': 'atom.xml', 'json': 'feed.json'}
+
+sitemap_namespace: str = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+atom_namespace: str = 'http://www.w3.org/2005/Atom'
+
+
+def rb_utc_date(date: datetime) -> datetime:
+    """
+    Makes a date timezone aware. Dates without a timezone (like the ones in the metadata of the content) are taken to be
+    in UTC, so the feeds are the same no matter where the site is built.
+
+    :param date: The date.
+
+    :return: The timezone aware date.
+    """
+    return date.replace(tzinfo=timezone.utc) if date.tzinfo is None else date
+
+
+def _rb_element(xml: XMLGenerator, name: str, text: str = None, attributes: dict = None) -> None:
+    xml.startElement(name, attributes or dict())
+    if text is not None:
+        xml.characters(str(text))
+    xml.endElement(name)
+
+
+def _rb_open(file_name: str, writer):
+    # ? Feeds written through an RBOutputWriter get minified, compressed and skipped like the pages.
+    if writer is not None:
+        return writer.open(file_name)
+    return open(file_name, 'w', encoding='utf-8')
+
+
+def _rb_start_xml(file) -> XMLGenerator:
+    xml: XMLGenerator = XMLGenerator(file, 'utf-8', short_empty_elements=True)
+    xml.startDocument()
+    return xml
+
+
+def _rb_write_urlset(file_name: str, urls: list, writer) -> None:
+    with _rb_open(file_name, writer) as file:
+        xml: XMLGenerator = _rb_start_xml(file)
+        xml.startElement('urlset', {'xmlns': sitemap_namespace})
+        for url, date in urls:
+            xml.startElement('url', dict())
+            _rb_element(xml, 'loc', url)
+            if date is not None:
+                _rb_element(xml, 'lastmod', rb_utc_date(date).isoformat())
+            xml.endElement('url')
+        xml.endElement('urlset')
+        xml.endDocument()
+
+
+def rb_write_sitemap(out_dir: str, site_url: str, urls: Iterable[tuple], max_urls: int = sitemap_max_urls,
+                     writer=None) -> list:
+    """
+    Writes sitemap.xml. If there are more urls than one sitemap may have, they are split into sitemap-1.xml,
+    sitemap-2.xml and so on, and sitemap.xml becomes the sitemap index that lists them. Only one sitemap's worth of
+    urls is in memory at a time.
+
+    :param out_dir: The output directory.
+    :param site_url: The url of the site, used for the links in the sitemap index.
+    :param urls: The absolute urls of the pages and the dates they last changed (or None), as tuples.
+    :param max_urls: The most urls one sitemap may have.
+        Default: 50000
+    :param writer: The RBOutputWriter to write the files with. Without one they are written straight away.
+        Default: None
+
+    :return: The files that were written.
+    """
+    urls = iter(urls)
+    chunk: list = list(islice(urls, max_urls))
+    next_chunk: list = list(islice(urls, max_urls))
+    if not next_chunk:
+        _rb_write_urlset(f'{out_dir}/sitemap.xml', chunk, writer)
+        return [f'{out_dir}/sitemap.xml']
+
+    files: list = list()
+    number: int = 1
+    while chunk:
+        files.append(f'{out_dir}/sitemap-{number}.xml')
+        _rb_write_urlset(files[-1], chunk, writer)
+        chunk, next_chunk = next_chunk, list(islice(urls, max_urls))
+        number += 1
+
+    with _rb_open(f'{out_dir}/sitemap.xml', writer) as file:
+        xml: XMLGenerator = _rb_start_xml(file)
+        xml.startElement('sitemapindex', {'xmlns': sitemap_namespace})
+        for sitemap in files:
+            xml.startElement('sitemap', dict())
+            _rb_element(xml, 'loc', f'{site_url.rstrip("/")}/{os.path.basename(sitemap)}')
+            xml.endElement('sitemap')
+        xml.endElement('sitemapindex')
+        xml.endDocument()
+
+    return files + [f'{out_dir}/sitemap.xml']
+
+
+def rb_write_rss_feed(file_name: str, feed: dict, entries: Iterator[tuple], writer=None) -> None:
+    """
+    Writes an RSS 2.0 feed.
+
+    :param file_name: The file to write the feed to.
+    :param feed: The title, link, description, author and url ("feed_url") of the feed.
+    :param entries: The title, absolute url, date and HTML of every entry, as tuples. They are written as they come, so
+        it can be a generator that only loads one entry at a time.
+    :param writer: The RBOutputWriter to write the feed with. Without one it is written straight away.
+        Default: None
+
+    :return: None
+    """
+    with _rb_open(file_name, writer) as file:
+        xml: XMLGenerator = _rb_start_xml(file)
+        xml.startElement('rss', {'version': '2.0', 'xmlns:atom': atom_namespace})
+        xml.startElement('channel', dict())
+        _rb_element(xml, 'title', feed['title'])
+        _rb_element(xml, 'link', feed['link'])
+        _rb_element(xml, 'description', feed['description'])
+        _rb_element(xml, 'atom:link', attributes={'href': feed['feed_url'], 'rel': 'self',
+                                                   'type': 'application/rss+xml'})
+        for title, url, date, html in entries:
+            xml.startElement('item', dict())
+            _rb_element(xml, 'title', title)
+            _rb_element(xml, 'link', url)
+            _rb_element(xml, 'guid', url, {'isPermaLink': 'true'})
+            _rb_element(xml, 'pubDate', format_datetime(rb_utc_date(date)))
+            _rb_element(xml, 'description', html)
+            xml.endElement('item')
+        xml.endElement('channel')
+        xml.endElement('rss')
+        xml.endDocument()
+
+
+def rb_write_atom_feed(file_name: str, feed: dict, entries: Iterator[tuple], writer=None) -> None:
+    """
+    Writes an Atom feed.
+
+    :param file_name: The file to write the feed to.
+    :param feed: The title, link, description, author and url ("feed_url") of the feed.
+    :param entries: The title, absolute url, date and HTML of every entry, as tuples. See rb_write_rss_feed.
+    :param writer: The RBOutputWriter to write the feed with. See rb_write_rss_feed.
+        Default: None
+
+    :return: None
+    """
+    entries = iter(entries)
+    first: tuple = next(entries, None)
+    # ? The feed was last updated when its newest entry was, which is the first one.
+    updated: datetime = first[2] if first is not None else datetime(1970, 1, 1)
+
+    with _rb_open(file_name, writer) as file:
+        xml: XMLGenerator = _rb_start_xml(file)
+        xml.startElement('feed', {'xmlns': atom_namespace})
+        _rb_element(xml, 'title', feed['title'])
+        _rb_element(xml, 'subtitle', feed['description'])
+        _rb_element(xml, 'id', feed['link'])
+        _rb_element(xml, 'link', attributes={'href': feed['link']})
+        _rb_element(xml, 'link', attributes={'href': feed['feed_url'], 'rel': 'self'})
+        _rb_element(xml, 'updated', rb_utc_date(updated).isoformat())
+        xml.startElement('author', dict())
+        _rb_element(xml, 'name', feed['author'])
+        xml.endElement('author')
+
+        for title, url, date, html in chain([first] if first is not None else [], entries):
+            xml.startElement('entry', dict())
+            _rb_element(xml, 'title', title)
+            _rb_element(xml, 'id', url)
+            _rb_element(xml, 'link', attributes={'href': url})
+            _rb_element(xml, 'updated', rb_utc_date(date).isoformat())
+            _rb_element(xml, 'content', html, {'type': 'html'})
+            xml.endElement('entry')
+        xml.endElement('feed')
+        xml.endDocument()
+
+
+def rb_write_json_feed(file_name: str, feed: dict, entries: Iterator[tuple], writer=None) -> None:
+    """
+    Writes a JSON Feed (version 1.1). The entries are written one at a time like in the XML feeds.
+
+    :param file_name: The file to write the feed to.
+    :param feed: The title, link, description, author and url ("feed_url") of the feed.
+    :param entries: The title, absolute url, date and HTML of every entry, as tuples. See rb_write_rss_feed.
+    :param writer: The RBOutputWriter to write the feed with. See rb_write_rss_feed.
+        Default: None
+
+    :return: None
+    """
+    header: dict = {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': feed['title'],
+        'home_page_url': feed['link'],
+        'feed_url': feed['feed_url'],
+        'description': feed['description'],
+        'authors': [{'name': feed['author']}],
+    }
+
+    with _rb_open(file_name, writer) as file:
+        # ? Writes the header without its closing brace so the items can be streamed into it.
+        file.write(json.dumps(header, ensure_ascii=False)[:-1])
+        file.write(', "items": [')
+        for index, (title, url, date, html) in enumerate(entries):
+            item: dict = {
+                'id': url,
+                'url': url,
+                'title': title,
+                'content_html': str(html),
+                'date_published': rb_utc_date(date).isoformat(),
+            }
+            file.write((', ' if index else '') + json.dumps(item, ensure_ascii=False))
+        file.write(']}')
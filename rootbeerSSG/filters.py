@@ -0,0 +1,77 @@
+from collections import OrderedDict
+
+from markupsafe import Markup
+
+from .cache import RBMarkdownCache
+from .parsing import RBLazyMarkdown
+from .utils import rb_hash_text
+
+
+class RBMarkdownFilter:
+    """
+    The mdify Jinja2 filter.
+
+    It has its own Markdown instance that is reset before every conversion, so filtering text in a template can never
+    change the metadata or the extention state of the Markdown instance the content is loaded with. Themes tend to
+    mdify the same text (like a tagline or an author bio) on every page, so the results are memoized. The memo only
+    keeps the most recently used results.
+    """
+
+    def __init__(self, extensions: list, cache: RBMarkdownCache = None, max_entries: int = 1024) -> None:
+        """
+        :param extensions: The import names of the markdown extentions to parse the text with.
+        :param cache: The persistent markdown cache to use when the text is not memoized.
+            Default: None
+        :param max_entries: The number of results to memoize.
+            Default: 1024
+
+        :return: None
+        """
+        self.md: RBLazyMarkdown = RBLazyMarkdown(extensions)
+        self.cache: RBMarkdownCache = cache
+        self.max_entries: int = max_entries
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._rb_memo: OrderedDict = OrderedDict()
+
+    def __call__(self, text: str) -> Markup:
+        text = str(text)
+
+        if text in self._rb_memo:
+            self.hits += 1
+            self._rb_memo.move_to_end(text)
+            return self._rb_memo[text]
+
+        self.misses += 1
+        html: Markup = Markup(self._rb_convert(text))
+
+        self._rb_memo[text] = html
+        if len(self._rb_memo) > self.max_entries:
+            self._rb_memo.popitem(last=False)
+
+        return html
+
+    def _rb_convert(self, text: str) -> str:
+        if self.cache is not None:
+            key: str = self.cache.key(rb_hash_text(text))
+            cached: tuple = self.cache.get(key)
+            if cached is not None:
+                self.cache.touch(key)
+                return cached[0]
+
+        self.md.reset()
+        html: str = self.md.convert(text)
+
+        if self.cache is not None:
+            self.cache.put(key, html, getattr(self.md, 'Meta', None))
+        return html
+
+    def stats(self) -> dict:
+        """
+        Gets the memo's hit and miss counts.
+
+        :return: A dict with the hits, misses and the number of memoized results.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._rb_memo)}
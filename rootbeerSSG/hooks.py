@@ -0,0 +1,174 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+
+from blinker import NamedSignal
+
+# The ways an item hook can be run over the items.
+hook_concurrency: tuple = ('serial', 'threads', 'asyncio')
+
+
+def rb_run_item_hook(hook, site, items: list, concurrency: str = 'serial', max_workers: int = 8) -> None:
+    """
+    Runs a hook for every item.
+
+    :param hook: The hook. It gets the site and one item. With asyncio it has to be an async function.
+    :param site: The RootbeerSSG object that is building.
+    :param items: The items.
+    :param concurrency: serial runs the hook for one item after the other. threads runs it on a pool of threads and
+        asyncio runs it on an event loop, which is good for hooks that mostly wait on files or the network.
+        Default: serial
+    :param max_workers: The most items the hook runs for at the same time with threads or asyncio.
+        Default: 8
+
+    :return: None
+    """
+    if concurrency == 'threads':
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # ? list() so the first error a hook raised is raised here.
+            list(executor.map(lambda item: hook(site, item), items))
+    elif concurrency == 'asyncio':
+        # ? Only imported when an asyncio hook runs because it is slow to import.
+        import asyncio
+
+        async def run_all() -> None:
+            semaphore: asyncio.Semaphore = asyncio.Semaphore(max_workers)
+
+            async def run_one(item) -> None:
+                async with semaphore:
+                    await hook(site, item)
+
+            await asyncio.gather(*(run_one(item) for item in items))
+
+        asyncio.run(run_all())
+    else:
+        for item in items:
+            hook(site, item)
+
+
+def _rb_connect(signal: NamedSignal, hook, run, background: bool):
+    # ? Named after the hook so the profiler reports it by the plugin's name.
+    @wraps(hook)
+    def receiver(sender, items: list = None, **kwargs) -> None:
+        if items is None:
+            return
+        if background:
+            sender.background.submit(run, sender, items)
+        else:
+            run(sender, items)
+
+    # ? The receiver has to be kept alive, because blinker only keeps a weak reference to it.
+    signal.connect(receiver, weak=False)
+    return receiver
+
+
+def batch_hook(signal: NamedSignal, background: bool = False):
+    """
+    Connects a function to a batch signal (like content_loaded or content_rendered). It gets the site and the whole
+    list of items at once instead of being called for every item like the during_* signals.
+
+    Example:
+        @batch_hook(content_loaded)
+        def count_words(rootbeer, items):
+            ...
+
+    :param signal: The batch signal.
+    :param background: Whether to run it on a background thread so the build goes on while it runs. The build waits
+        for it before the next phase that needs the items or starts processes (the images for content_loaded, the
+        end of the build for content_rendered).
+        Default: False
+
+    :return: The decorator. The function is returned as it is.
+    """
+    def decorator(hook):
+        hook.rb_receiver = _rb_connect(signal, hook, hook, background)
+        return hook
+    return decorator
+
+
+def item_hook(signal: NamedSignal, concurrency: str = 'threads', max_workers: int = 8, background: bool = False):
+    """
+    Connects a function to a batch signal (like content_loaded or content_rendered) and runs it for every item in the
+    batch, at the same time for many items if it should. Made for hooks that wait on I/O, like reading cached oEmbed
+    data or looking at the size of images.
+
+    Example:
+        @item_hook(content_loaded, concurrency='asyncio', max_workers=16)
+        async def add_embeds(rootbeer, item):
+            item['embeds'] = await read_embeds(item.metadata.get('embeds', []))
+
+    :param signal: The batch signal.
+    :param concurrency: serial, threads or asyncio. See rb_run_item_hook.
+        Default: threads
+    :param max_workers: The most items the hook runs for at the same time.
+        Default: 8
+    :param background: Whether to run it on a background thread so the build goes on while it runs. See batch_hook.
+        Default: False
+
+    :return: The decorator. The function is returned as it is.
+    """
+    if concurrency not in hook_concurrency:
+        raise ValueError(f'"{concurrency}" is not a hook concurrency. Use serial, threads or asyncio.')
+
+    def decorator(hook):
+        def run(site, items: list) -> None:
+            rb_run_item_hook(hook, site, items, concurrency, max_workers)
+
+        hook.rb_receiver = _rb_connect(signal, hook, run, background)
+        return hook
+    return decorator
+
+
+class RBBackgroundHooks:
+    """
+    Runs the hooks that asked to run in the background on their own threads and waits for them when the build needs
+    what they do.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        """
+        :param max_workers: The number of hooks that can run at the same time.
+            Default: 4
+
+        :return: None
+        """
+        self.max_workers: int = max_workers
+        self._rb_executor: ThreadPoolExecutor = None
+        self._rb_futures: list = list()
+
+    def submit(self, hook, *args) -> Future:
+        """
+        Starts a hook in the background.
+
+        :param hook: The hook.
+        :param args: The arguments of the hook.
+
+        :return: The future of the hook.
+        """
+        # ? The threads are only started when a hook runs in the background, which most builds never do.
+        if self._rb_executor is None:
+            self._rb_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='rb-hook')
+        future: Future = self._rb_executor.submit(hook, *args)
+        self._rb_futures.append(future)
+        return future
+
+    def wait(self) -> None:
+        """
+        Waits for all the hooks that are running in the background.
+
+        :return: None
+        """
+        futures, self._rb_futures = self._rb_futures, list()
+        for future in futures:
+            # ? Raises the error of the first hook that failed.
+            future.result()
+
+    def close(self) -> None:
+        """
+        Waits for the hooks and stops the threads.
+
+        :return: None
+        """
+        self.wait()
+        if self._rb_executor is not None:
+            self._rb_executor.shutdown(wait=True)
+            self._rb_executor = None
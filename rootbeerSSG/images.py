@@ -0,0 +1,237 @@
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+
+from .assets import RBStaticSync, rb_hashed_file_name, rb_link_or_copy_file
+from .errors import RBMissingOptionalDependency
+from .utils import rb_remove_output_file
+
+try:
+    from PIL import Image
+except ImportError:
+    # ? Pillow is optional. It is only needed when image variants are turned on. pip install rootbeerSSG[images]
+    Image = None
+
+# The static files that get variants, by extension.
+image_extensions: tuple = ('.jpg', '.jpeg', '.png', '.webp')
+
+# The formats Pillow saves each extension as.
+pillow_formats: dict = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.webp': 'WEBP'}
+
+
+def rb_variant_name(file: str, width: int, image_format: str) -> str:
+    """
+    Gets the name of a variant of an image, like "img/photo.jpg" -> "img/photo.480w.webp".
+
+    :param file: The name of the image.
+    :param width: The width of the variant.
+    :param image_format: The extension of the variant, or "original" for the extension of the image.
+
+    :return: The name of the variant.
+    """
+    root, extension = os.path.splitext(file)
+    extension = extension if image_format == 'original' else f'.{image_format}'
+    return f'{root}.{width}w{extension}'
+
+
+def rb_remove_image_variants(cache_dir: str, out_dir: str) -> None:
+    """
+    Deletes the variants the last build put into the output directory, for when image variants are turned off. The
+    cached variants are kept in case they are turned on again.
+
+    :param cache_dir: The directory the variants are cached in.
+    :param out_dir: The output directory.
+
+    :return: None
+    """
+    outputs_file: str = f'{cache_dir}/outputs.json'
+    if not os.path.exists(outputs_file):
+        return
+    with open(outputs_file, 'r', encoding='utf-8') as file:
+        for output in json.load(file):
+            rb_remove_output_file(f'{out_dir}/{output}', out_dir)
+    os.remove(outputs_file)
+
+
+def _rb_make_variants(source: str, variants: list, quality: int) -> tuple:
+    """
+    Makes the variants of one image. Runs in a worker process.
+
+    :param source: The image file.
+    :param variants: A list of tuples of the width, the extension and the cache file of every variant to make.
+    :param quality: The quality to save lossy formats with.
+
+    :return: A tuple of the width and height of the image.
+    """
+    with Image.open(source) as image:
+        image.load()
+        size: tuple = image.size
+        for width, extension, cache_file in variants:
+            if width >= image.width:
+                # ? Images are never made bigger.
+                continue
+            height: int = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+            if pillow_formats[extension] == 'JPEG' and resized.mode not in ('RGB', 'L'):
+                resized = resized.convert('RGB')
+
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            # ? Saves to a temporary file first so a half written variant never ends up in the cache.
+            resized.save(f'{cache_file}.tmp', format=pillow_formats[extension], quality=quality)
+            os.replace(f'{cache_file}.tmp', cache_file)
+    return size
+
+
+class RBImageProcessor:
+    """
+    Makes resized (and optionally re-encoded, like WebP) variants of the images in the static directory so pages can
+    serve smaller images with srcset.
+
+    Variants are cached in the cache directory by the hash of their image, their width, format and quality, so an
+    image is only processed again when it or the settings change. The images that do need processing are processed
+    on a pool of processes. Variants are never made wider than their image.
+    """
+
+    def __init__(self, static_sync: RBStaticSync, cache_dir: str, widths: list, formats: list = None,
+                 quality: int = 80, jobs: int = 1) -> None:
+        """
+        :param static_sync: The static file sync of the build. Its hashes are used to find the changed images.
+        :param cache_dir: The directory the variants and their index are cached in.
+        :param widths: The widths of the variants.
+        :param formats: The formats of the variants, like "webp". "original" is the format of the image itself.
+            Default: ['original']
+        :param quality: The quality to save lossy formats with.
+            Default: 80
+        :param jobs: The number of processes that make variants.
+            Default: 1
+
+        :return: None
+        """
+        if Image is None:
+            raise RBMissingOptionalDependency('Image variants need Pillow. Install it with '
+                                              '"pip install rootbeerSSG[images]" or turn off image_variants.')
+
+        self.static_sync: RBStaticSync = static_sync
+        self.cache_dir: str = cache_dir
+        self.widths: list = sorted(widths)
+        self.formats: list = formats or ['original']
+        self.quality: int = quality
+        self.jobs: int = jobs
+
+        # The width and height of every image, by hash.
+        self.sizes: dict = dict()
+        # The variants of every image, by the name of the image. Each variant is a tuple of its name and width.
+        self.variants: dict = dict()
+        # Whether any variant was added or removed since the last build.
+        self.changed: bool = False
+        # The images that could not be read. They don't get variants, so pages use the images themselves.
+        self.failed: set = set()
+
+        self.index_file: str = f'{cache_dir}/index.json'
+        self.outputs_file: str = f'{cache_dir}/outputs.json'
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r', encoding='utf-8') as file:
+                self.sizes = json.load(file)
+
+    def _rb_cache_file(self, file_hash: str, width: int, extension: str) -> str:
+        return f'{self.cache_dir}/{file_hash[:2]}/{file_hash}-{width}-{self.quality}{extension}'
+
+    def _rb_planned_variants(self, file: str, file_hash: str, image_width: int = None) -> list:
+        variants: list = list()
+        for image_format in self.formats:
+            extension: str = os.path.splitext(file)[1].lower() if image_format == 'original' else f'.{image_format}'
+            for width in self.widths:
+                if image_width is not None and width >= image_width:
+                    continue
+                variants.append((width, extension, self._rb_cache_file(file_hash, width, extension)))
+        return variants
+
+    def process(self) -> dict:
+        """
+        Makes the variants of all the images that don't have them cached yet and puts every variant into the output
+        directory.
+
+        :return: The variants of every image.
+        """
+        images: dict = {file: file_hash for file, file_hash in self.static_sync.file_hashes.items()
+                        if file.lower().endswith(image_extensions)}
+
+        to_process: dict = dict()
+        for file, file_hash in images.items():
+            image_width: int = self.sizes[file_hash][0] if file_hash in self.sizes else None
+            missing: list = [variant for variant in self._rb_planned_variants(file, file_hash, image_width)
+                             if not os.path.exists(variant[2])]
+            if image_width is None or missing:
+                to_process[file_hash] = (file, missing if image_width else self._rb_planned_variants(file, file_hash))
+
+        if to_process:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                futures: dict = {file_hash: executor.submit(_rb_make_variants, f'{self.static_sync.static_dir}/{file}',
+                                                            variants, self.quality)
+                                 for file_hash, (file, variants) in to_process.items()}
+                for file_hash, future in futures.items():
+                    try:
+                        self.sizes[file_hash] = list(future.result())
+                    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as error:
+                        # ? One broken image (like a truncated upload) should not stop the build. It is still copied
+                        # ? as it is and tried again next build.
+                        print(f'Could not make the variants of "{to_process[file_hash][0]}": {error}')
+
+        self.failed = {file for file, file_hash in images.items() if file_hash not in self.sizes}
+
+        previous_outputs: dict = dict()
+        if os.path.exists(self.outputs_file):
+            with open(self.outputs_file, 'r', encoding='utf-8') as file:
+                previous_outputs = json.load(file)
+
+        outputs: dict = dict()
+        for file, file_hash in images.items():
+            self.variants[file] = list()
+            if file in self.failed:
+                continue
+            for width, extension, cache_file in self._rb_planned_variants(file, file_hash, self.sizes[file_hash][0]):
+                if not os.path.exists(cache_file):
+                    # ? Made before the image turned out to be narrower than this variant.
+                    continue
+                name: str = rb_variant_name(file, width, extension.lstrip('.'))
+                if self.static_sync.hash_file_names:
+                    name = rb_hashed_file_name(name, file_hash)
+                output: str = f'{self.static_sync.out_dir}/{name}'
+                # ? The quality is not in the name, so a variant is also copied again when it comes from another file.
+                if previous_outputs.get(name) != cache_file or not os.path.exists(output):
+                    rb_link_or_copy_file(cache_file, output)
+                self.variants[file].append((name, width))
+                outputs[name] = cache_file
+
+        for output in previous_outputs.keys() - outputs.keys():
+            rb_remove_output_file(f'{self.static_sync.out_dir}/{output}', self.static_sync.out_dir)
+        self.changed = previous_outputs.keys() != outputs.keys()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.index_file, 'w', encoding='utf-8') as file:
+            json.dump(self.sizes, file)
+        with open(self.outputs_file, 'w', encoding='utf-8') as file:
+            json.dump(outputs, file, indent=2)
+
+        return self.variants
+
+    def srcset(self, file: str, image_format: str = None) -> list:
+        """
+        Gets the variants of an image for a srcset attribute.
+
+        :param file: The name of the image in the static directory.
+        :param image_format: The format of the variants, like "webp". The image itself is only used if it has this
+            format too. None is the format of the image.
+            Default: None
+
+        :return: A list of tuples of the name and the width of every variant, plus the image itself, from the
+            narrowest to the widest.
+        """
+        file = file.lstrip('/')
+        extension: str = f'.{image_format}' if image_format else os.path.splitext(file)[1].lower()
+        variants: list = [(name, width) for name, width in self.variants.get(file, []) if name.endswith(extension)]
+
+        file_hash: str = self.static_sync.file_hashes.get(file)
+        if file_hash in self.sizes and file.lower().endswith(extension):
+            variants.append((self.static_sync.asset_map.get(file, file), self.sizes[file_hash][0]))
+        return sorted(variants, key=lambda variant: variant[1])
@@ -0,0 +1,159 @@
+import json
+import os
+
+
+class RBBuildManifest:
+    """
+    Keeps track of what every content file produced during a build so that the next build can skip the content that
+    did not change, delete the outputs of content that was removed and only re-render the listing pages when needed.
+
+    The manifest is saved as JSON and has this layout:
+
+    {
+        "version": 1,
+        "config": "<hash of the site config>",
+        "items": {
+            "<source file>": {
+                "hash": "<hash of the source file>",
+                "mtime": <modification time of the source file>,
+                "templates": {"<template name>": "<hash of the template>"},
+                "outputs": ["<output file>"]
+            }
+        },
+        "listings": {
+            "<listing name>": {"hash": "<hash of everything the listing depends on>", "outputs": ["<output file>"]}
+        }
+    }
+    """
+    version: int = 1
+
+    def __init__(self, manifest_file: str) -> None:
+        """
+        :param manifest_file: The path of the JSON file the manifest is read from and saved to.
+
+        :return: None
+        """
+        self.manifest_file: str = manifest_file
+
+        self.previous: dict = self._rb_empty_manifest()
+        self.current: dict = self._rb_empty_manifest()
+
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r', encoding='utf-8') as file:
+                try:
+                    previous: dict = json.load(file)
+                except ValueError:
+                    # ? A broken manifest just means that everything gets rebuilt.
+                    previous = dict()
+            if previous.get('version') == self.version:
+                self.previous = previous
+
+    def _rb_empty_manifest(self) -> dict:
+        return {'version': self.version, 'config': None, 'items': dict(), 'listings': dict()}
+
+    def set_config_hash(self, config_hash: str) -> bool:
+        """
+        Records the hash of the site config.
+
+        :param config_hash: The hash of the site config.
+
+        :return: True if the config is the same as the one used for the previous build.
+        """
+        self.current['config'] = config_hash
+        return self.previous['config'] == config_hash
+
+    def is_item_unchanged(self, source: str, source_hash: str, templates: dict, outputs: list = None) -> bool:
+        """
+        Checks if a content item would render to the same output as in the previous build.
+
+        :param source: The source file of the item.
+        :param source_hash: The current hash of the source file.
+        :param templates: The names and hashes of the templates the item is rendered with.
+        :param outputs: The files the item is rendered to now. If they moved (like when its slug changed), the item
+            has to be rendered again.
+            Default: None
+
+        :return: True if the item can be skipped.
+        """
+        previous: dict = self.previous['items'].get(source)
+        if previous is None:
+            return False
+        if previous['hash'] != source_hash or previous['templates'] != templates:
+            return False
+        if outputs is not None and previous['outputs'] != outputs:
+            return False
+        return all(os.path.exists(output) for output in previous['outputs'])
+
+    def record_item(self, source: str, source_hash: str, mtime: float, templates: dict, outputs: list) -> None:
+        """
+        Records a content item for the current build.
+
+        :param source: The source file of the item.
+        :param source_hash: The hash of the source file.
+        :param mtime: The modification time of the source file.
+        :param templates: The names and hashes of the templates the item is rendered with.
+        :param outputs: The files the item produced.
+
+        :return: None
+        """
+        self.current['items'][source] = {
+            'hash': source_hash,
+            'mtime': mtime,
+            'templates': templates,
+            'outputs': outputs,
+        }
+
+    def is_listing_unchanged(self, name: str, listing_hash: str) -> bool:
+        """
+        Checks if a listing page (like the index or the archive) would render to the same output as in the previous
+        build.
+
+        :param name: The name of the listing.
+        :param listing_hash: The hash of everything the listing depends on.
+
+        :return: True if the listing can be skipped.
+        """
+        previous: dict = self.previous['listings'].get(name)
+        if previous is None or previous['hash'] != listing_hash:
+            return False
+        return all(os.path.exists(output) for output in previous['outputs'])
+
+    def record_listing(self, name: str, listing_hash: str, outputs: list) -> None:
+        """
+        Records a listing page for the current build.
+
+        :param name: The name of the listing.
+        :param listing_hash: The hash of everything the listing depends on.
+        :param outputs: The files the listing produced.
+
+        :return: None
+        """
+        self.current['listings'][name] = {'hash': listing_hash, 'outputs': outputs}
+
+    def stale_outputs(self) -> list:
+        """
+        Gets the outputs of the previous build that the current build did not produce.
+
+        :return: The list of stale output files.
+        """
+        current_outputs: set = set()
+        for entry in [*self.current['items'].values(), *self.current['listings'].values()]:
+            current_outputs.update(entry['outputs'])
+
+        stale: list = list()
+        for entry in [*self.previous['items'].values(), *self.previous['listings'].values()]:
+            stale.extend(output for output in entry['outputs'] if output not in current_outputs)
+        return stale
+
+    def save(self) -> None:
+        """
+        Saves the current build's manifest so the next build can use it.
+
+        :return: None
+        """
+        manifest_dir: str = os.path.dirname(self.manifest_file)
+        if manifest_dir:
+            os.makedirs(manifest_dir, exist_ok=True)
+
+        with open(self.manifest_file, 'w', encoding='utf-8') as file:
+            json.dump(self.current, file, indent=2)
@@ -0,0 +1,203 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from hashlib import sha256
+from io import StringIO
+from threading import BoundedSemaphore, Lock
+import gzip
+import os
+import re
+
+from .errors import RBConfigError, RBMissingOptionalDependency
+
+try:
+    import brotli
+except ImportError:
+    # ? Brotli is optional. It is only needed when .br files are turned on. pip install rootbeerSSG[brotli]
+    brotli = None
+
+# The file extensions that get minified and the ones that get compressed siblings.
+minify_extensions: tuple = ('.html', '.htm')
+compress_extensions: tuple = ('.html', '.htm', '.css', '.js', '.json', '.xml', '.svg', '.txt')
+
+# The compressed siblings that can be written and the extension they get.
+compression_extensions: dict = {'gzip': '.gz', 'brotli': '.br'}
+
+# Elements whose whitespace matters, and comments that are not really comments (like <!--[if IE]>).
+_rb_preserved_html = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+_rb_html_comment = re.compile(r'<!--(?!\[if|<!|>).*?-->', re.DOTALL)
+_rb_whitespace = re.compile(r'\s+')
+
+
+def rb_minify_html(html: str) -> str:
+    """
+    Makes HTML smaller without changing how it looks: comments are removed and every run of whitespace becomes one
+    space. Whatever is inside pre, textarea, script and style elements is left as it is.
+
+    :param html: The HTML.
+
+    :return: The minified HTML.
+    """
+    parts: list = _rb_preserved_html.split(html)
+    minified: list = list()
+    # ? split() puts the preserved elements and their tag names (from the group) between the parts around them.
+    for index in range(0, len(parts), 3):
+        minified.append(_rb_whitespace.sub(' ', _rb_html_comment.sub('', parts[index])))
+        if index + 1 < len(parts):
+            minified.append(parts[index + 1])
+    return ''.join(minified).strip()
+
+
+def rb_compress(data: bytes, compression: str) -> bytes:
+    """
+    Compresses data the way a web server would send it. gzip files don't get a date so the same data always gives the
+    same file.
+
+    :param data: The data.
+    :param compression: gzip or brotli.
+
+    :return: The compressed data.
+    """
+    if compression == 'brotli':
+        return brotli.compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class RBOutputWriter:
+    """
+    Writes the rendered files on a small pool of threads so rendering does not have to wait on the disk.
+
+    Only a limited number of writes can be waiting at a time. When that limit is hit, write() blocks until a write
+    finished so the rendered pages don't pile up in memory.
+
+    HTML can be minified before it is written, and text files can get .gz and .br siblings next to them so a CDN or web
+    server can send them already compressed. They are compressed on the same threads (zlib and brotli let the other
+    threads run while they work). A file is not written again when its new contents hash the same as the file that is
+    already there, so unchanged files keep their mtimes and syncing the output directory only uploads what changed.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64, minify: bool = False,
+                 compression: list = None) -> None:
+        """
+        :param max_workers: The number of threads that write files.
+            Default: 4
+        :param max_pending: The number of writes that can be waiting at a time.
+            Default: 64
+        :param minify: Whether to minify HTML files.
+            Default: False
+        :param compression: The compressed siblings to write next to text files: gzip (.gz) and/or brotli (.br).
+            Default: None
+
+        :return: None
+        """
+        self.minify: bool = minify
+        self.compression: list = list(compression or list())
+        for compression_type in self.compression:
+            if compression_type not in compression_extensions:
+                raise RBConfigError(f'"{compression_type}" is not a compression type. Use gzip or brotli.')
+        if 'brotli' in self.compression and brotli is None:
+            raise RBMissingOptionalDependency('Writing .br files needs Brotli. Install it with: '
+                                              'pip install rootbeerSSG[brotli]')
+
+        # The number of files that were written and the number that were skipped because they did not change.
+        self.written: int = 0
+        self.unchanged: int = 0
+
+        self._rb_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers)
+        self._rb_pending: BoundedSemaphore = BoundedSemaphore(max_pending)
+        self._rb_futures: list = list()
+        self._rb_lock: Lock = Lock()
+
+    def write(self, file: str, text: str) -> None:
+        """
+        Queues a file to be written. Its parent directories are created if they don't exist.
+
+        :param file: The file to write.
+        :param text: The text to write to the file.
+
+        :return: None
+        """
+        self._rb_pending.acquire()
+        future: Future = self._rb_executor.submit(self._rb_write, file, text)
+        future.add_done_callback(lambda _: self._rb_pending.release())
+        self._rb_futures.append(future)
+
+    @contextmanager
+    def open(self, file: str):
+        """
+        Gets a text stream that is queued to be written to a file when the with block ends, for code that writes a
+        file bit by bit like the feeds do.
+
+        Example:
+            with writer.open('public/feed.xml') as feed_file:
+                feed_file.write(...)
+
+        :param file: The file to write.
+
+        :return: The stream.
+        """
+        stream: StringIO = StringIO()
+        yield stream
+        self.write(file, stream.getvalue())
+
+    def siblings(self, file: str) -> list:
+        """
+        Gets the compressed siblings a file gets.
+
+        :param file: The file.
+
+        :return: The names of the siblings, like ["public/index.html.gz"].
+        """
+        if not file.endswith(compress_extensions):
+            return list()
+        return [f'{file}{compression_extensions[compression_type]}' for compression_type in self.compression]
+
+    def _rb_write(self, file: str, text: str) -> None:
+        if self.minify and file.endswith(minify_extensions):
+            text = rb_minify_html(text)
+        data: bytes = text.encode('utf-8')
+
+        changed: bool = not self._rb_is_same(file, data)
+        if changed:
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            with open(file, 'wb') as output_file:
+                output_file.write(data)
+
+        for compression_type, sibling in zip(self.compression, self.siblings(file)):
+            # ? A sibling is only missing when compression was just turned on, otherwise it changes with its file.
+            if changed or not os.path.exists(sibling):
+                with open(sibling, 'wb') as sibling_file:
+                    sibling_file.write(rb_compress(data, compression_type))
+
+        with self._rb_lock:
+            if changed:
+                self.written += 1
+            else:
+                self.unchanged += 1
+
+    def _rb_is_same(self, file: str, data: bytes) -> bool:
+        try:
+            # ? Files of another size can't be the same, so most changed files are never read.
+            if os.path.getsize(file) != len(data):
+                return False
+            with open(file, 'rb') as existing_file:
+                return sha256(existing_file.read()).digest() == sha256(data).digest()
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        """
+        Waits for all the queued files to be written.
+
+        :return: None
+        """
+        self._rb_executor.shutdown(wait=True)
+        futures, self._rb_futures = self._rb_futures, list()
+        for future in futures:
+            # ? Raises the error of the first write that failed.
+            future.result()
+
+    def __enter__(self) -> 'RBOutputWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,138 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from time import perf_counter
+from typing import Iterator
+
+from markdown import Markdown
+
+from .cache import RBMarkdownCache
+from .utils import rb_hash_text
+
+
+class RBLazyMarkdown:
+    """
+    A Markdown instance that is only made the first time it is used. Making one loads and sets up every extention,
+    which takes longer than loading a whole site from the markdown cache, so builds where every file is cached never
+    make one at all. Everything else is passed on to the Markdown instance.
+    """
+    __slots__ = ('extensions', '_rb_md')
+
+    def __init__(self, extensions: list) -> None:
+        """
+        :param extensions: The import names of the markdown extentions.
+
+        :return: None
+        """
+        self.extensions: list = extensions
+        self._rb_md: Markdown = None
+
+    @property
+    def md(self) -> Markdown:
+        if self._rb_md is None:
+            self._rb_md = Markdown(extensions=self.extensions)
+        return self._rb_md
+
+    def __getattr__(self, name: str):
+        return getattr(self.md, name)
+
+
+# The Markdown instance of a worker process. Every worker builds its own because a Markdown object keeps state between
+# conversions and can't be shared between processes.
+_rb_worker_md: RBLazyMarkdown = None
+_rb_worker_cache: RBMarkdownCache = None
+
+
+def rb_resolve_jobs(jobs: int) -> int:
+    """
+    Turns the jobs setting into the number of processes to use.
+
+    :param jobs: The jobs setting. 0 or less means one process per CPU core.
+
+    :return: The number of processes to use.
+    """
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return cpu_count() or 1
+    return jobs
+
+
+def rb_parse_markdown(md, file: str, cache: RBMarkdownCache = None) -> tuple:
+    """
+    Reads and parses a markdown file.
+
+    :param md: The Markdown (or RBLazyMarkdown) instance to parse the file with.
+    :param file: The markdown file.
+    :param cache: The cache to look the parsed file up in first.
+        Default: None
+
+    :return: A tuple of the file's name, the hash of its source, the parsed HTML, its metadata, whether it came
+        from the cache and the seconds it took.
+    """
+    start: float = perf_counter()
+    with open(file, 'r', encoding='utf-8') as content_file:
+        source: str = content_file.read()
+    source_hash: str = rb_hash_text(source)
+
+    if cache is not None:
+        cached: tuple = cache.get(cache.key(source_hash))
+        if cached is not None:
+            return file, source_hash, cached[0], cached[1], True, perf_counter() - start
+
+    md.reset()
+    parsed_content: str = md.convert(source)
+
+    return file, source_hash, parsed_content, getattr(md, 'Meta', None), False, perf_counter() - start
+
+
+def _rb_init_parse_worker(extensions: list, cache: RBMarkdownCache) -> None:
+    global _rb_worker_md, _rb_worker_cache
+    _rb_worker_md = RBLazyMarkdown(extensions)
+    _rb_worker_cache = cache
+
+
+def _rb_parse_in_worker(file: str) -> tuple:
+    return rb_parse_markdown(_rb_worker_md, file, _rb_worker_cache)
+
+
+def rb_parse_markdown_files(files: list, md, extensions: list, jobs: int = 1,
+                            cache: RBMarkdownCache = None) -> Iterator[tuple]:
+    """
+    Parses markdown files, in parallel if more than one job is used. The results always come back in the same order
+    as the files.
+
+    Files that are in the cache are not parsed again. Newly parsed files are added to the cache here, in the calling
+    process, so the workers only ever read from it.
+
+    :param files: The markdown files to parse.
+    :param md: The Markdown instance used when only one job is used.
+    :param extensions: The import names of the markdown extentions the worker processes load.
+    :param jobs: The number of processes to parse the files with.
+        Default: 1
+    :param cache: The cache of parsed markdown.
+        Default: None
+
+    :return: An iterator of tuples of each file's name, the hash of its source, its parsed HTML, its metadata, whether
+        it came from the cache and the seconds it took to parse.
+    """
+    if jobs <= 1 or len(files) <= 1:
+        results: Iterator[tuple] = (rb_parse_markdown(md, file, cache) for file in files)
+        yield from _rb_update_cache(results, cache)
+        return
+
+    # ? Sending the files in chunks keeps the workers busy without a round trip for every file.
+    chunksize: int = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_rb_init_parse_worker,
+                             initargs=(extensions, cache)) as executor:
+        yield from _rb_update_cache(executor.map(_rb_parse_in_worker, files, chunksize=chunksize), cache)
+
+
+def _rb_update_cache(results: Iterator[tuple], cache: RBMarkdownCache) -> Iterator[tuple]:
+    for result in results:
+        file, source_hash, parsed_content, metadata, cached, _ = result
+        if cache is not None:
+            if cached:
+                cache.touch(cache.key(source_hash))
+            else:
+                cache.put(cache.key(source_hash), parsed_content, metadata)
+        yield result
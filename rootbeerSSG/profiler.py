@@ -0,0 +1,280 @@
+from sys import platform
+from time import perf_counter, process_time
+import json
+import os
+import tracemalloc
+
+from blinker import NamedSignal
+
+from .signals import *
+
+try:
+    from resource import RUSAGE_CHILDREN, RUSAGE_SELF, getrusage
+except ImportError:
+    # ? The resource module is not available on Windows.
+    getrusage = None
+
+# The signals that start and end each phase of a build.
+phase_signals: dict = {
+    'content_load': (before_content_load, after_content_load),
+    'content_render': (before_content_render, after_content_render),
+    'render_index': (before_render_index, after_render_index),
+    'render_archive': (before_render_archive, after_render_archive),
+    'render_taxonomies': (before_render_taxonomies, after_render_taxonomies),
+    'render_feeds': (before_render_feeds, after_render_feeds),
+}
+
+
+def rb_max_rss(children: bool = False) -> int:
+    """
+    Gets the peak resident memory of this process.
+
+    :param children: Whether to get the peak of the largest child process that finished instead, like the processes
+        that parse and render with --jobs.
+        Default: False
+
+    :return: The peak resident memory in bytes or 0 if it can't be measured on this platform.
+    """
+    if getrusage is None:
+        return 0
+    max_rss: int = getrusage(RUSAGE_CHILDREN if children else RUSAGE_SELF).ru_maxrss
+    # ? Linux reports it in kilobytes, macOS in bytes.
+    return max_rss if platform == 'darwin' else max_rss * 1024
+
+
+class RBBuildProfiler:
+    """
+    Measures where the time of a build goes.
+
+    The phases of the build are timed by listening to the before_* and after_* signals, so they line up with what
+    plugins see. For every phase the wall time, the CPU time of this process and the peak memory are recorded. The
+    parse and render time of every file is recorded too, and so is the time spent in every plugin receiver of every
+    signal that is sent through send().
+    """
+
+    def __init__(self, top: int = 10, trace_memory: bool = True) -> None:
+        """
+        :param top: The number of slowest files, templates and receivers the console report lists.
+            Default: 10
+        :param trace_memory: Whether to measure the peak memory of every phase with tracemalloc. This makes the
+            build a lot slower, so turn it off when only the times matter. The peak resident memory of the process is
+            always measured.
+            Default: True
+
+        :return: None
+        """
+        self.top: int = top
+        self.trace_memory: bool = trace_memory
+
+        self.phases: dict = dict()
+        self.files: dict = dict()
+        self.templates: dict = dict()
+        self.receivers: dict = dict()
+        self.stats: dict = dict()
+
+        self._rb_site = None
+        self._rb_started: dict = dict()
+        self._rb_build_start: tuple = None
+        self._rb_receivers: list = list()
+        self._rb_tracing: bool = False
+
+    def start(self, site) -> None:
+        """
+        Starts profiling a build.
+
+        :param site: The RootbeerSSG object that is building.
+
+        :return: None
+        """
+        self._rb_site = site
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._rb_tracing = True
+        self._rb_build_start = (perf_counter(), process_time())
+
+        for phase, (before, after) in phase_signals.items():
+            start_receiver = self._rb_phase_receiver(self._rb_start_phase, phase)
+            end_receiver = self._rb_phase_receiver(self._rb_end_phase, phase)
+            before.connect(start_receiver, sender=site)
+            after.connect(end_receiver, sender=site)
+            self._rb_receivers += [(before, start_receiver), (after, end_receiver)]
+
+    def stop(self) -> None:
+        """
+        Stops profiling the build.
+
+        :return: None
+        """
+        wall_start, cpu_start = self._rb_build_start
+        self.phases['total'] = {
+            'wall': perf_counter() - wall_start,
+            'cpu': process_time() - cpu_start,
+            'peak_memory': tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0,
+            'max_rss': rb_max_rss(),
+            'max_rss_children': rb_max_rss(children=True),
+        }
+
+        for signal, receiver in self._rb_receivers:
+            signal.disconnect(receiver, sender=self._rb_site)
+        self._rb_receivers = list()
+        self._rb_site = None
+
+        if self._rb_tracing:
+            tracemalloc.stop()
+            self._rb_tracing = False
+
+    def _rb_phase_receiver(self, method, phase: str):
+        def receiver(sender) -> None:
+            method(phase)
+        # ? Marks the receiver so send() does not count it as a plugin.
+        receiver.rb_profiler = True
+        return receiver
+
+    def _rb_start_phase(self, phase: str) -> None:
+        # ? reset_peak() came in Python 3.9. Before that every phase reports the peak of the build so far.
+        if tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self._rb_started[phase] = (perf_counter(), process_time())
+
+    def _rb_end_phase(self, phase: str) -> None:
+        wall_start, cpu_start = self._rb_started.pop(phase)
+        self.phases[phase] = {
+            'wall': perf_counter() - wall_start,
+            'cpu': process_time() - cpu_start,
+            'peak_memory': tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0,
+            'max_rss': rb_max_rss(),
+            'max_rss_children': rb_max_rss(children=True),
+        }
+
+    def send(self, signal: NamedSignal, sender, **kwargs) -> None:
+        """
+        Sends a signal and times every receiver on it.
+
+        :param signal: The signal to send.
+        :param sender: The sender of the signal.
+        :param kwargs: The data sent with the signal, like the items of a batch signal.
+
+        :return: None
+        """
+        for receiver in signal.receivers_for(sender):
+            if getattr(receiver, 'rb_profiler', False):
+                receiver(sender)
+                continue
+
+            start: float = perf_counter()
+            receiver(sender, **kwargs)
+            elapsed: float = perf_counter() - start
+
+            name: str = f'{signal.name}: {getattr(receiver, "__module__", "?")}.' \
+                        f'{getattr(receiver, "__qualname__", repr(receiver))}'
+            entry: dict = self.receivers.setdefault(name, {'calls': 0, 'time': 0.0})
+            entry['calls'] += 1
+            entry['time'] += elapsed
+
+    def record_parse(self, file: str, seconds: float, cached: bool) -> None:
+        """
+        Records how long a file took to parse.
+
+        :param file: The markdown file.
+        :param seconds: The time it took to parse (or to read from the markdown cache).
+        :param cached: Whether the file came from the markdown cache.
+
+        :return: None
+        """
+        entry: dict = self.files.setdefault(file, {'parse': 0.0, 'render': 0.0})
+        entry['parse'] = seconds
+        entry['cached'] = cached
+
+    def record_render(self, file: str, template: str, seconds: float) -> None:
+        """
+        Records how long a file took to render.
+
+        :param file: The markdown file.
+        :param template: The template the file was rendered with.
+        :param seconds: The time it took to render.
+
+        :return: None
+        """
+        self.files.setdefault(file, {'parse': 0.0, 'render': 0.0})['render'] = seconds
+        self.record_template(template, seconds)
+
+    def record_template(self, template: str, seconds: float) -> None:
+        """
+        Records a render of a template.
+
+        :param template: The name of the template.
+        :param seconds: The time it took to render.
+
+        :return: None
+        """
+        entry: dict = self.templates.setdefault(template, {'renders': 0, 'time': 0.0})
+        entry['renders'] += 1
+        entry['time'] += seconds
+
+    def report(self) -> dict:
+        """
+        Gets everything that was measured.
+
+        :return: A dict that can be saved as JSON.
+        """
+        return {
+            'phases': self.phases,
+            'files': self.files,
+            'templates': self.templates,
+            'receivers': self.receivers,
+            'stats': self.stats,
+        }
+
+    def save(self, report_file: str) -> None:
+        """
+        Saves the report as JSON.
+
+        :param report_file: The file to save the report to.
+
+        :return: None
+        """
+        report_dir: str = os.path.dirname(report_file)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+        with open(report_file, 'w', encoding='utf-8') as file:
+            json.dump(self.report(), file, indent=2)
+
+    def print_report(self) -> None:
+        """
+        Prints a summary of the report.
+
+        :return: None
+        """
+        print('\n===== BUILD PROFILE =====')
+        width: int = max(len(phase) for phase in ['phase', *self.phases])
+        print(f'{"phase":<{width}} {"wall (s)":>10} {"cpu (s)":>10} {"peak mem (MiB)":>15} {"max rss (MiB)":>14} '
+              f'{"worker rss (MiB)":>17}')
+        for phase, entry in self.phases.items():
+            print(f'{phase:<{width}} {entry["wall"]:>10.3f} {entry["cpu"]:>10.3f} '
+                  f'{entry["peak_memory"] / 1024 / 1024:>15.1f} {entry["max_rss"] / 1024 / 1024:>14.1f} '
+                  f'{entry["max_rss_children"] / 1024 / 1024:>17.1f}')
+
+        slowest_files: list = sorted(self.files.items(), key=lambda file: file[1]['parse'] + file[1]['render'],
+                                     reverse=True)[:self.top]
+        if slowest_files:
+            print(f'\nSlowest {len(slowest_files)} files:')
+            for file, entry in slowest_files:
+                print(f'  {entry["parse"] + entry["render"]:8.4f}s  (parse {entry["parse"]:.4f}s, '
+                      f'render {entry["render"]:.4f}s)  {file}')
+
+        slowest_templates: list = sorted(self.templates.items(), key=lambda template: template[1]['time'],
+                                         reverse=True)[:self.top]
+        if slowest_templates:
+            print(f'\nSlowest {len(slowest_templates)} templates:')
+            for template, entry in slowest_templates:
+                print(f'  {entry["time"]:8.4f}s  ({entry["renders"]} renders)  {template}')
+
+        slowest_receivers: list = sorted(self.receivers.items(), key=lambda receiver: receiver[1]['time'],
+                                         reverse=True)[:self.top]
+        if slowest_receivers:
+            print(f'\nSlowest {len(slowest_receivers)} plugin receivers:')
+            for receiver, entry in slowest_receivers:
+                print(f'  {entry["time"]:8.4f}s  ({entry["calls"]} calls)  {receiver}')
+
+        for name, stats in self.stats.items():
+            print(f'\n{name}: {stats}')
@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from time import perf_counter
+from typing import Iterator
+
+# The site that is being rendered. Worker processes are forked so they get a copy of it (with its Environment, compiled
+# templates, filters and content) without anything having to be pickled.
+_rb_worker_site = None
+
+
+def rb_can_render_in_parallel() -> bool:
+    """
+    Checks if content can be rendered in worker processes. Workers have to be forked so they get a copy of the site,
+    which isn't possible on every platform.
+
+    :return: True if the fork start method is available.
+    """
+    return 'fork' in get_all_start_methods()
+
+
+def rb_render_item(site, item) -> tuple:
+    """
+    Renders a content item with the template of its type.
+
+    :param site: The RootbeerSSG object the item belongs to.
+    :param item: The item to render.
+
+    :return: A tuple of the file the item should be written to, the rendered HTML and the seconds it took to render.
+    """
+    start: float = perf_counter()
+    template = site.env.get_template(f'{item.type}.html')
+    html: str = template.render(rootbeer=site, this=item, config=site.config)
+    return f'{item.content_path_url}/index.html', html, perf_counter() - start
+
+
+def _rb_render_in_worker(index: int) -> tuple:
+    return rb_render_item(_rb_worker_site, _rb_worker_site.content[index])
+
+
+def rb_render_items(site, indexes: list, jobs: int = 1, before_render=None) -> Iterator[tuple]:
+    """
+    Renders content items, in parallel if more than one job is used. The results always come back in the same order
+    as the indexes.
+
+    :param site: The RootbeerSSG object the items belong to.
+    :param indexes: The indexes of the items to render in site.content.
+    :param jobs: The number of processes to render the items with.
+    :param before_render: A function that is called with every item before it is rendered. When the items are
+        rendered one after the other it is called right before each of them. In parallel it is called for all the
+        items before the workers start, because they only get a copy of the site as it was when they were forked.
+        Default: None
+
+    :return: An iterator of tuples of the file each item should be written to, its rendered HTML and the seconds it
+        took to render.
+    """
+    if jobs <= 1 or len(indexes) <= 1 or not rb_can_render_in_parallel():
+        for index in indexes:
+            if before_render is not None:
+                before_render(site.content[index])
+            yield rb_render_item(site, site.content[index])
+        return
+
+    if before_render is not None:
+        for index in indexes:
+            before_render(site.content[index])
+
+    global _rb_worker_site
+    # ? Compiles every template that is needed before forking so the workers don't each compile them again.
+    for content_type in {site.content[index].type for index in indexes}:
+        site.env.get_template(f'{content_type}.html')
+
+    _rb_worker_site = site
+    try:
+        chunksize: int = max(1, len(indexes) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=get_context('fork')) as executor:
+            yield from executor.map(_rb_render_in_worker, indexes, chunksize=chunksize)
+    finally:
+        _rb_worker_site = None
@@ -0,0 +1,325 @@
+from concurrent.futures import ProcessPoolExecutor
+from html import unescape
+import json
+import os
+import re
+
+from .utils import rb_hash_config, rb_hash_text, rb_remove_output_file
+
+# How much a word counts in each part of an item.
+title_weight: int = 5
+metadata_weight: int = 2
+content_weight: int = 1
+
+search_js_content: str = r'''// Searches the index RootbeerSSG writes next to this file.
+// Only the shards of the searched words are downloaded.
+//
+// <script src="/search/search.js"></script>
+// RootbeerSearch('/search/').search('some words', 10).then(function (results) {
+//     // results: [{url: ..., title: ..., score: ...}, ...], the best ones first
+// });
+(function (global) {
+    'use strict';
+
+    function tokenize(text) {
+        return (text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []).filter(function (word) {
+            return word.length > 1;
+        });
+    }
+
+    function shardName(word, prefixLength) {
+        var prefix = Array.from(word).slice(0, prefixLength).join('');
+        if (/^[a-z0-9_]+$/.test(prefix)) {
+            return prefix;
+        }
+        return 'u' + Array.from(new TextEncoder().encode(prefix), function (byte) {
+            return byte.toString(16).padStart(2, '0');
+        }).join('');
+    }
+
+    function RootbeerSearch(baseUrl) {
+        var base = baseUrl.replace(/\/?$/, '/');
+        var index = null;
+        var shards = {};
+
+        function fetchJson(url) {
+            return fetch(url).then(function (response) {
+                return response.json();
+            });
+        }
+
+        function loadShard(name) {
+            if (!shards[name]) {
+                shards[name] = fetchJson(base + 'shards/' + name + '.json');
+            }
+            return shards[name];
+        }
+
+        function search(query, limit) {
+            index = index || fetchJson(base + 'docs.json');
+            return index.then(function (meta) {
+                var words = tokenize(query);
+                var names = words.map(function (word) {
+                    return shardName(word, meta.prefix);
+                });
+                return Promise.all(names.map(function (name) {
+                    return meta.shards.indexOf(name) === -1 ? {} : loadShard(name);
+                })).then(function (loaded) {
+                    var scores = {};
+                    words.forEach(function (word, position) {
+                        var shard = loaded[position];
+                        // Words at least as long as the prefix also match the longer words that start with them.
+                        var terms = Array.from(word).length < meta.prefix ? [word] : Object.keys(shard).filter(
+                            function (term) {
+                                return term.indexOf(word) === 0;
+                            });
+                        terms.forEach(function (term) {
+                            var postings = shard[term] || [];
+                            for (var i = 0; i < postings.length; i += 2) {
+                                scores[postings[i]] = (scores[postings[i]] || 0) + postings[i + 1];
+                            }
+                        });
+                    });
+                    return Object.keys(scores).sort(function (a, b) {
+                        return scores[b] - scores[a];
+                    }).slice(0, limit || 10).map(function (doc) {
+                        return {url: meta.docs[doc][0], title: meta.docs[doc][1], score: scores[doc]};
+                    });
+                });
+            });
+        }
+
+        return {search: search};
+    }
+
+    global.RootbeerSearch = RootbeerSearch;
+})(this);
+'''
+
+
+def rb_tokenize(text: str) -> list:
+    """
+    Splits text into lowercase words, like the query helper does. Words that are only one character long are dropped.
+
+    :param text: The text.
+
+    :return: The words.
+    """
+    return [word for word in re.findall(r'\w+', text.lower()) if len(word) > 1]
+
+
+def rb_strip_html(html: str) -> str:
+    """
+    Gets the text of some HTML.
+
+    :param html: The HTML.
+
+    :return: The text.
+    """
+    return unescape(re.sub(r'<[^>]+>', ' ', html))
+
+
+def rb_shard_name(word: str, prefix_length: int) -> str:
+    """
+    Gets the name of the shard a word is in. Shards are named after the start of their words, or its hex encoding
+    (with a "u" in front) if it has characters that are not safe in every file name and url.
+
+    :param word: The word.
+    :param prefix_length: The number of characters of the start of the word shards are split by.
+
+    :return: The name of the shard.
+    """
+    prefix: str = word[:prefix_length]
+    if re.fullmatch(r'[a-z0-9_]+', prefix):
+        return prefix
+    return f'u{prefix.encode("utf-8").hex()}'
+
+
+def rb_index_document(title: str, metadata_text: str, html: str) -> dict:
+    """
+    Counts the words of an item. Words in the title and the metadata count more than words in the content.
+
+    :param title: The title of the item.
+    :param metadata_text: The text of the metadata fields that are searched.
+    :param html: The rendered content of the item.
+
+    :return: A dict of the words and their weights.
+    """
+    terms: dict = dict()
+    parts: tuple = ((title, title_weight), (metadata_text, metadata_weight), (rb_strip_html(html), content_weight))
+    for text, weight in parts:
+        for word in rb_tokenize(text):
+            terms[word] = terms.get(word, 0) + weight
+    return terms
+
+
+def _rb_index_documents(documents: list) -> list:
+    return [rb_index_document(*document) for document in documents]
+
+
+class RBSearchIndex:
+    """
+    Builds the client-side search index of the site into "search/" in the output directory.
+
+    It is an inverted index: every word points to the items it is in and how much it counts in each. The words are
+    split into shards by their first characters, so a search only downloads the shards of the words it looks for.
+    "docs.json" has the url and title of every item and the list of shards, and "search.js" is a small helper that
+    queries the index.
+
+    The words of every item are cached by the hash of its source file, so only new and changed items are indexed
+    again, on a pool of processes when there are a lot of them. Shards whose contents did not change are not written
+    again, and shards that are left empty are deleted.
+    """
+
+    def __init__(self, out_dir: str, cache_dir: str, prefix_length: int = 2, metadata_fields: list = None,
+                 jobs: int = 1, writer=None) -> None:
+        """
+        :param out_dir: The output directory.
+        :param cache_dir: The directory the words of every item are cached in.
+        :param prefix_length: The number of characters of the start of the words the shards are split by.
+            Default: 2
+        :param metadata_fields: The metadata fields that are searched besides the title.
+            Default: None
+        :param jobs: The number of processes that index the items.
+            Default: 1
+        :param writer: The RBOutputWriter to write the index with. Without one it is written straight away.
+            Default: None
+
+        :return: None
+        """
+        self.search_dir: str = f'{out_dir}/search'
+        self.cache_dir: str = cache_dir
+        self.prefix_length: int = prefix_length
+        self.metadata_fields: list = metadata_fields or list()
+        self.jobs: int = jobs
+        self.writer = writer
+
+        # The number of items that were indexed and the names of the shards that were written this build.
+        self.indexed: int = 0
+        self.written: list = list()
+
+        self.index_file: str = f'{cache_dir}/index.json'
+        self.documents_file: str = f'{cache_dir}/documents.json'
+
+    def _rb_load_json(self, file_name: str) -> dict:
+        if not os.path.exists(file_name):
+            return dict()
+        with open(file_name, 'r', encoding='utf-8') as file:
+            try:
+                return json.load(file)
+            except ValueError:
+                return dict()
+
+    def _rb_save_json(self, file_name: str, data: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+
+    def _rb_write(self, file_name: str, text: str) -> None:
+        if self.writer is not None:
+            self.writer.write(file_name, text)
+            return
+        with open(file_name, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    def _rb_metadata_text(self, item) -> str:
+        values: list = list()
+        for field in self.metadata_fields:
+            value = item.metadata.get(field)
+            if isinstance(value, (list, tuple)):
+                values.extend(str(part) for part in value)
+            elif value is not None:
+                values.append(str(value))
+        return ' '.join(values)
+
+    def build(self, items: list, source_hashes: dict, url_maker) -> bool:
+        """
+        Builds the index.
+
+        :param items: The content items to index.
+        :param source_hashes: The hashes of the source files of the items, by file name.
+        :param url_maker: A function that turns the url of an item into the url the search results link to.
+
+        :return: True if anything in the output directory changed.
+        """
+        docs: list = [[url_maker(f'{item.url}/'), item.metadata.get('title', item.slug)] for item in items]
+        keys: list = [(item.file_name, source_hashes[item.file_name]) for item in items]
+        settings: dict = {'prefix': self.prefix_length, 'fields': self.metadata_fields}
+        signature: str = rb_hash_config({'docs': docs, 'keys': keys, 'settings': settings})
+
+        previous_index: dict = self._rb_load_json(self.index_file)
+        previous_shards: dict = previous_index.get('shards', dict())
+        outputs: list = [f'{self.search_dir}/docs.json', f'{self.search_dir}/search.js'] + \
+                        [f'{self.search_dir}/shards/{name}.json' for name in previous_shards]
+        if previous_index.get('signature') == signature and all(os.path.exists(output) for output in outputs):
+            return False
+
+        # ===== INDEX THE NEW AND CHANGED ITEMS =====
+        cached: dict = self._rb_load_json(self.documents_file)
+        if cached.get('settings') != settings:
+            cached = {'settings': settings, 'documents': dict()}
+
+        documents: dict = dict()
+        to_index: list = list()
+        for item, (file_name, source_hash) in zip(items, keys):
+            entry: dict = cached['documents'].get(file_name)
+            if entry is not None and entry['hash'] == source_hash:
+                documents[file_name] = entry
+            else:
+                to_index.append(item)
+
+        texts: list = [(str(item.metadata.get('title', '')), self._rb_metadata_text(item), str(item.content))
+                       for item in to_index]
+        if self.jobs > 1 and len(texts) > 64:
+            chunks: list = [texts[index::self.jobs * 4] for index in range(self.jobs * 4)]
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                results: list = list(executor.map(_rb_index_documents, chunks))
+            # ? Puts the results back in the order of the items.
+            indexed: list = [None] * len(texts)
+            for offset, chunk_results in enumerate(results):
+                indexed[offset::self.jobs * 4] = chunk_results
+        else:
+            indexed = _rb_index_documents(texts)
+
+        self.indexed = len(to_index)
+        for item, terms in zip(to_index, indexed):
+            documents[item.file_name] = {'hash': source_hashes[item.file_name], 'terms': terms}
+
+        # ===== MERGE THEM INTO THE SHARDS =====
+        shards: dict = dict()
+        for doc_id, (file_name, _) in enumerate(keys):
+            for term, weight in documents[file_name]['terms'].items():
+                shard: dict = shards.setdefault(rb_shard_name(term, self.prefix_length), dict())
+                shard.setdefault(term, []).extend((doc_id, weight))
+
+        os.makedirs(f'{self.search_dir}/shards', exist_ok=True)
+        shard_hashes: dict = dict()
+        for name in sorted(shards):
+            text: str = json.dumps(shards[name], ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+            shard_hashes[name] = rb_hash_text(text)
+            shard_file: str = f'{self.search_dir}/shards/{name}.json'
+            if previous_shards.get(name) != shard_hashes[name] or not os.path.exists(shard_file):
+                self._rb_write(shard_file, text)
+                self.written.append(name)
+
+        for name in previous_shards.keys() - shard_hashes.keys():
+            rb_remove_output_file(f'{self.search_dir}/shards/{name}.json', self.search_dir)
+
+        self._rb_write(f'{self.search_dir}/docs.json',
+                       json.dumps({'prefix': self.prefix_length, 'shards': sorted(shard_hashes), 'docs': docs},
+                                  ensure_ascii=False, separators=(',', ':')))
+        self._rb_write(f'{self.search_dir}/search.js', search_js_content)
+
+        self._rb_save_json(self.documents_file, {'settings': settings, 'documents': documents})
+        self._rb_save_json(self.index_file, {'signature': signature, 'shards': shard_hashes})
+        return True
+
+    def outputs(self) -> list:
+        """
+        Gets the files the index is made of.
+
+        :return: The files.
+        """
+        shards: dict = self._rb_load_json(self.index_file).get('shards', dict())
+        return [f'{self.search_dir}/docs.json', f'{self.search_dir}/search.js'] + \
+               [f'{self.search_dir}/shards/{name}.json' for name in sorted(shards)]
@@ -0,0 +1,203 @@
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from threading import Condition, Thread
+from time import sleep
+from traceback import print_exc
+import os
+
+from . import RootbeerSSG
+
+# The path browsers listen on to find out when the site was rebuilt.
+livereload_path: str = '/__rootbeer/livereload'
+
+livereload_script: bytes = (
+    f'<script>new EventSource("{livereload_path}").onmessage = function () {{ location.reload(); }};</script>'
+).encode('utf-8')
+
+
+def rb_snapshot_files(paths: list) -> dict:
+    """
+    Gets the modification time of every file in some directories and files.
+
+    :param paths: The directories and files to look at. Paths that don't exist are ignored.
+
+    :return: A dict of the files and their modification times.
+    """
+    snapshot: dict = dict()
+    for watched_path in paths:
+        if os.path.isfile(watched_path):
+            snapshot[watched_path] = os.path.getmtime(watched_path)
+            continue
+        for directory, _, files in os.walk(watched_path):
+            for file in files:
+                file = os.path.join(directory, file)
+                try:
+                    snapshot[file] = os.path.getmtime(file)
+                except FileNotFoundError:
+                    # ? The file was deleted while the directory was being walked.
+                    pass
+    return snapshot
+
+
+class RBDevRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the output directory. Every HTML page gets a small script that reloads the page when the site is rebuilt.
+    """
+    server: 'RBDevHTTPServer'
+
+    def do_GET(self) -> None:
+        if self.path.split('?')[0] == livereload_path:
+            self._rb_stream_reloads()
+            return
+
+        html_file: str = self._rb_html_file()
+        if html_file is None:
+            super().do_GET()
+            return
+
+        with open(html_file, 'rb') as file:
+            html: bytes = file.read()
+
+        if b'</body>' in html:
+            html = html.replace(b'</body>', livereload_script + b'</body>', 1)
+        else:
+            html += livereload_script
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(html)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(html)
+
+    def _rb_html_file(self):
+        requested: str = self.translate_path(self.path)
+        if os.path.isdir(requested):
+            # ? Directories without a trailing slash are redirected by SimpleHTTPRequestHandler.
+            if not self.path.split('?')[0].endswith('/'):
+                return None
+            requested = os.path.join(requested, 'index.html')
+        if requested.endswith('.html') and os.path.isfile(requested):
+            return requested
+        return None
+
+    def _rb_stream_reloads(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+
+        build: int = self.server.build_number
+        try:
+            while True:
+                with self.server.rebuilt:
+                    self.server.rebuilt.wait_for(lambda: self.server.build_number != build, timeout=15)
+                if self.server.build_number != build:
+                    build = self.server.build_number
+                    self.wfile.write(b'data: reload\n\n')
+                else:
+                    # ? Keeps the connection open.
+                    self.wfile.write(b': ping\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class RBDevHTTPServer(ThreadingHTTPServer):
+    daemon_threads: bool = True
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.build_number: int = 0
+        self.rebuilt: Condition = Condition()
+
+    def notify_rebuilt(self) -> None:
+        """
+        Tells every open page to reload.
+
+        :return: None
+        """
+        with self.rebuilt:
+            self.build_number += 1
+            self.rebuilt.notify_all()
+
+
+class RBDevServer:
+    """
+    Serves the site on a local HTTP server and rebuilds it whenever the content, the theme or the config changes.
+
+    Rebuilds happen in this process with incremental builds turned on, so the parsed markdown, the Jinja2 environment
+    and the compiled templates stay warm and only the changed items and listing pages are rendered again. A change to
+    the config makes a new RootbeerSSG object because it can change everything. Open pages reload themselves after
+    every rebuild.
+    """
+
+    def __init__(self, config_file: str = '.rbconfig', host: str = 'localhost', port: int = 8000,
+                 jobs: int = None, interval: float = 0.5) -> None:
+        """
+        :param config_file: The config file for your site.
+            Default: .rbconfig
+        :param host: The host to serve the site on.
+            Default: localhost
+        :param port: The port to serve the site on.
+            Default: 8000
+        :param jobs: The number of processes used to parse and render the content.
+            Default: None
+        :param interval: How many seconds to wait between checks for changed files.
+            Default: 0.5
+
+        :return: None
+        """
+        self.config_file: str = config_file
+        self.host: str = host
+        self.port: int = port
+        self.jobs: int = jobs
+        self.interval: float = interval
+
+        self.site: RootbeerSSG = RootbeerSSG(config_file, jobs=jobs, incremental=True)
+
+    def _rb_watched_paths(self) -> list:
+        return [self.config_file, self.site.cont_dir, f'{self.site.themes_dir}/{self.site.theme}']
+
+    def _rb_rebuild(self, changed_files: set) -> None:
+        try:
+            if self.config_file in changed_files:
+                self.site = RootbeerSSG(self.config_file, jobs=self.jobs, incremental=True)
+            else:
+                self.site.build()
+        except Exception:
+            # ? A broken template or markdown file shouldn't stop the server. Fix it and it gets rebuilt again.
+            print_exc()
+
+    def serve_forever(self) -> None:
+        """
+        Serves the site until the program is stopped with Ctrl+C.
+
+        :return: None
+        """
+        handler = partial(RBDevRequestHandler, directory=self.site.out_dir)
+        http_server: RBDevHTTPServer = RBDevHTTPServer((self.host, self.port), handler)
+        Thread(target=http_server.serve_forever, daemon=True).start()
+
+        print(f'Serving "{self.site.out_dir}/" on http://{self.host}:{self.port}/. Press Ctrl+C to stop.')
+
+        snapshot: dict = rb_snapshot_files(self._rb_watched_paths())
+        try:
+            while True:
+                sleep(self.interval)
+                new_snapshot: dict = rb_snapshot_files(self._rb_watched_paths())
+                if new_snapshot == snapshot:
+                    continue
+
+                changed_files: set = {file for file in snapshot.keys() | new_snapshot.keys()
+                                      if snapshot.get(file) != new_snapshot.get(file)}
+                snapshot = new_snapshot
+
+                print(f'{len(changed_files)} file(s) changed, rebuilding. . .')
+                self._rb_rebuild(changed_files)
+                http_server.notify_rebuilt()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            http_server.shutdown()
+            http_server.server_close()
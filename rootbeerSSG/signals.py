@@ -14,4 +14,15 @@ after_render_index: NamedSignal = signal('after_render_index')
 
 before_render_archive: NamedSignal = signal('before_render_archive')
 during_render_archive: NamedSignal = signal('during_render_archive')
-after_render_archive: NamedSignal = signal('after_render_archive')
\ No newline at end of file
+after_render_archive: NamedSignal = signal('after_render_archive')
+
+before_render_taxonomies: NamedSignal = signal('before_render_taxonomies')
+during_render_taxonomy: NamedSignal = signal('during_render_taxonomy')
+after_render_taxonomies: NamedSignal = signal('after_render_taxonomies')
+
+before_render_feeds: NamedSignal = signal('before_render_feeds')
+after_render_feeds: NamedSignal = signal('after_render_feeds')
+
+# Sent once with all the items as "items", for plugins that work on the whole batch. See hooks.py.
+content_loaded: NamedSignal = signal('content_loaded')
+content_rendered: NamedSignal = signal('content_rendered')
@@ -0,0 +1,78 @@
+from os import path
+
+import yaml
+
+from .utils import rb_create_path_if_does_not_exist
+from .create_config_file import rb_create_default_config_file
+from .create_default_theme import rb_create_default_theme
+
+# ? The C loader is a lot faster but is only there when PyYAML was built with libyaml.
+YAMLLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class RBSite:
+    """
+    A site: its config file and the steps to set it up and build it.
+
+    Making one does nothing but remember the config file, and the config is only read the first time it is used, so it
+    is cheap to make one just to look at the config. init() creates everything a new site needs and build() builds it.
+
+    Example:
+        site = RBSite('.rbconfig').init()
+        rootbeer = site.build(jobs=4)
+    """
+
+    def __init__(self, config_file: str = '.rbconfig') -> None:
+        """
+        :param config_file: The config file for your site. Uses YAML syntax. Does not have to be a .rbconfig file.
+            Default: .rbconfig
+
+        :return: None
+        """
+        self.config_file: str = config_file
+        self._rb_config: dict = None
+
+    @property
+    def config(self) -> dict:
+        """
+        The config of the site, read from the config file the first time it is used.
+        """
+        if self._rb_config is None:
+            with open(self.config_file, 'r') as config_f:
+                self._rb_config = yaml.load(config_f, Loader=YAMLLoader)
+        return self._rb_config
+
+    def init(self) -> 'RBSite':
+        """
+        Creates the config file, the directories, the plugins package and the default theme of the site if they don't
+        exist yet. Nothing that already exists is touched, so it is safe (and quick) to run before every build.
+
+        :return: The site.
+        """
+        rb_create_default_config_file(self.config_file)
+
+        content_dir: str = self.config['content_directory']
+        for directory in ('plugins', content_dir, self.config['themes_dir'], f'{content_dir}/static',
+                          f'{content_dir}/pages', f'{content_dir}/posts'):
+            rb_create_path_if_does_not_exist(directory)
+
+        if not path.exists('plugins/__init__.py'):
+            with open('plugins/__init__.py', 'w') as plugins_main:
+                plugins_main.write('# :) hi')
+
+        if not path.exists(f'{self.config["themes_dir"]}/RBDefault'):
+            rb_create_default_theme(self.config['themes_dir'])
+
+        return self
+
+    def build(self, **options):
+        """
+        Builds the site.
+
+        :param options: The options of RootbeerSSG, like jobs, incremental or profile.
+
+        :return: The RootbeerSSG object that built the site.
+        """
+        from . import RootbeerSSG
+
+        return RootbeerSSG(self.config_file, site=self, **options)
@@ -0,0 +1,115 @@
+from tempfile import mkstemp
+import os
+import sqlite3
+
+
+class RBContentStore:
+    """
+    A temporary store for the HTML of the content, used by streaming builds so that the bodies of all the content
+    don't have to be held in memory at once. The store is a SQLite file that is deleted when the store is closed.
+
+    Every process that reads from the store (like the workers that render the content) opens its own connection.
+    """
+    batch_size: int = 256
+
+    def __init__(self, directory: str) -> None:
+        """
+        :param directory: The directory the temporary file is created in.
+
+        :return: None
+        """
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, self.store_file = mkstemp(prefix='content-', suffix='.sqlite', dir=directory)
+        os.close(file_descriptor)
+
+        self._rb_pid: int = -1
+        self._rb_db: sqlite3.Connection = None
+        self._rb_pending: dict = dict()
+
+    def _rb_connection(self) -> sqlite3.Connection:
+        if self._rb_pid != os.getpid():
+            self._rb_db = sqlite3.connect(self.store_file, timeout=30)
+            self._rb_db.execute('CREATE TABLE IF NOT EXISTS content (key TEXT PRIMARY KEY, html TEXT NOT NULL)')
+            self._rb_pid = os.getpid()
+        return self._rb_db
+
+    def put(self, key: str, html: str) -> None:
+        """
+        Adds a body to the store.
+
+        :param key: The key of the body, like the file name of its content.
+        :param html: The HTML of the body.
+
+        :return: None
+        """
+        self._rb_pending[key] = html
+        if len(self._rb_pending) >= self.batch_size:
+            self.flush()
+
+    def get(self, key: str) -> str:
+        """
+        Gets a body from the store.
+
+        :param key: The key of the body.
+
+        :return: The HTML of the body.
+        """
+        if key in self._rb_pending:
+            return self._rb_pending[key]
+        return self._rb_connection().execute('SELECT html FROM content WHERE key = ?', (key,)).fetchone()[0]
+
+    def flush(self) -> None:
+        """
+        Writes the bodies that were added to the store file.
+
+        :return: None
+        """
+        if not self._rb_pending:
+            return
+        with self._rb_connection() as db:
+            db.executemany('INSERT OR REPLACE INTO content (key, html) VALUES (?, ?)', self._rb_pending.items())
+        self._rb_pending.clear()
+
+    def close(self) -> None:
+        """
+        Closes the store and deletes its file.
+
+        :return: None
+        """
+        if self._rb_db is not None and self._rb_pid == os.getpid():
+            self._rb_db.close()
+        self._rb_db = None
+        self._rb_pid = -1
+        self._rb_pending.clear()
+        if os.path.exists(self.store_file):
+            os.remove(self.store_file)
+
+
+class RBLazyContent:
+    """
+    Stands in for the HTML of a content item in streaming builds. The HTML is only read from the content store when
+    a template outputs it, and it is not kept after that.
+    """
+    __slots__ = ('store', 'key')
+
+    def __init__(self, store: RBContentStore, key: str) -> None:
+        """
+        :param store: The store the HTML is in.
+        :param key: The key of the HTML in the store.
+
+        :return: None
+        """
+        self.store: RBContentStore = store
+        self.key: str = key
+
+    def __str__(self) -> str:
+        return self.store.get(self.key)
+
+    def __html__(self) -> str:
+        return self.store.get(self.key)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return f'<RBLazyContent {self.key!r}>'
@@ -0,0 +1,117 @@
+from slug import slug
+
+
+class RBTerm:
+    """
+    One term of a taxonomy, like the tag "python", and the posts that have it.
+    """
+    __slots__ = ('taxonomy', 'name', 'slug', 'items')
+
+    def __init__(self, taxonomy: 'RBTaxonomy', name: str, term_slug: str) -> None:
+        """
+        :param taxonomy: The taxonomy the term belongs to.
+        :param name: The name of the term, as it was first written in the metadata.
+        :param term_slug: The slug of the term, used in its url.
+
+        :return: None
+        """
+        self.taxonomy: RBTaxonomy = taxonomy
+        self.name: str = name
+        self.slug: str = term_slug
+        self.items: list = list()
+
+    @property
+    def url(self) -> str:
+        """
+        The url of the first page of the term, relative to the site's url.
+        """
+        return self.taxonomy.page_url(self, 1)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return f'<RBTerm {self.taxonomy.name}/{self.name!r}>'
+
+
+class RBTaxonomy(dict):
+    """
+    The index of a taxonomy (a metadata field like "tags" or "categories"): a dict of its terms by their slug. It is
+    built while the content is loaded, so templates can get the posts of a term without looping over all the posts.
+
+    Terms can be looked up by their name too, like rootbeer.taxonomies.tags['Python'] in a template, so the values in
+    an item's metadata can be used as they are.
+    """
+
+    def __init__(self, name: str, base_url: str) -> None:
+        """
+        :param name: The metadata field of the taxonomy.
+        :param base_url: The url the pages of the terms are under, relative to the site's url.
+
+        :return: None
+        """
+        super().__init__()
+        self.name: str = name
+        self.base_url: str = base_url
+
+    def __missing__(self, key: str) -> RBTerm:
+        term_slug: str = slug(str(key))
+        if term_slug != key and term_slug in self:
+            return self[term_slug]
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def add(self, item) -> None:
+        """
+        Adds an item to the terms in its metadata field. The field can be one term or a list of them.
+
+        :param item: The content item.
+
+        :return: None
+        """
+        values = item.metadata.get(self.name)
+        if values is None:
+            return
+        if not isinstance(values, (list, tuple, set)):
+            values = [values]
+
+        for value in values:
+            term_slug: str = slug(str(value))
+            if not term_slug:
+                continue
+            if term_slug not in self:
+                self[term_slug] = RBTerm(self, str(value), term_slug)
+            term: RBTerm = dict.__getitem__(self, term_slug)
+            # ? The same term can be in an item's metadata twice, like "Python" and "python".
+            if not term.items or term.items[-1] is not item:
+                term.items.append(item)
+
+    def sort_items(self, ordered_items: list) -> None:
+        """
+        Sorts the items of every term in the order of another list, like the sorted posts.
+
+        :param ordered_items: The items in the order they should be in.
+
+        :return: None
+        """
+        positions: dict = {id(item): position for position, item in enumerate(ordered_items)}
+        for term in self.values():
+            term.items.sort(key=lambda item: positions.get(id(item), len(positions)))
+
+    def page_url(self, term: RBTerm, page: int) -> str:
+        """
+        Gets the url of a page of a term.
+
+        :param term: The term.
+        :param page: The number of the page, starting at 1.
+
+        :return: The url, relative to the site's url.
+        """
+        if page == 1:
+            return f'{self.base_url}/{term.slug}/'
+        return f'{self.base_url}/{term.slug}/page-{page}/'
@@ -0,0 +1,162 @@
+from functools import wraps
+from tempfile import mkstemp
+from time import perf_counter
+import os
+
+import jinja2
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, pass_context, select_autoescape
+from jinja2.bccache import Bucket
+
+from .utils import rb_hash_config
+
+# The files in a theme that are templates. Everything else (like css or images) is never compiled.
+template_extensions: tuple = ('.html', '.htm', '.xml', '.txt', '.j2', '.jinja', '.jinja2')
+
+# Goes up when what RootbeerSSG compiles into templates changes, so the templates compiled before are not used.
+bytecode_version: int = 1
+
+
+class RBBytecodeCache(FileSystemBytecodeCache):
+    """
+    Stores the compiled templates in the cache directory so they don't have to be compiled again on the next build.
+
+    Jinja2 checks the source of a template against the one its bytecode was compiled from, so changing a template
+    always recompiles it. The settings of the Environment are not part of Jinja2's keys though, so they are added to
+    the names of the cache files here. Files are written atomically because more than one build (or process) can write
+    the same template at the same time.
+    """
+
+    def __init__(self, directory: str, settings: dict) -> None:
+        """
+        :param directory: The directory the compiled templates are stored in.
+        :param settings: The settings of the Environment that change how templates are compiled.
+
+        :return: None
+        """
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(directory, f'{rb_hash_config(settings)[:16]}-%s.cache')
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        temp_fd, temp_file = mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(temp_fd, 'wb') as file:
+                bucket.write_bytecode(file)
+            os.replace(temp_file, self._get_cache_filename(bucket))
+        except OSError:
+            # ? Not being able to cache a template is not worth failing the build over.
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+class RBEnvironment(Environment):
+    """
+    The Jinja2 Environment of the theme. It counts how many templates it compiled and how long that took.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """
+        Resets the compile counts, like at the start of a build.
+
+        :return: None
+        """
+        self.compiled: int = 0
+        self.compile_time: float = 0.0
+        if isinstance(self.bytecode_cache, RBBytecodeCache):
+            self.bytecode_cache.hits = 0
+            self.bytecode_cache.misses = 0
+
+    def compile(self, source, name=None, filename=None, raw=False, defer_init=False):
+        start: float = perf_counter()
+        try:
+            return super().compile(source, name, filename, raw, defer_init)
+        finally:
+            self.compiled += 1
+            self.compile_time += perf_counter() - start
+
+    def stats(self) -> dict:
+        """
+        Gets the compile counts.
+
+        :return: A dict with the number of compiled templates, the seconds it took and the bytecode cache hits.
+        """
+        stats: dict = {'compiled': self.compiled, 'compile_time': round(self.compile_time, 6)}
+        if isinstance(self.bytecode_cache, RBBytecodeCache):
+            stats['bytecode_cache_hits'] = self.bytecode_cache.hits
+        return stats
+
+
+def rb_build_filter(function):
+    """
+    Marks a filter whose result depends on the build (like the urls of the content or the hashed names of the static
+    files). Jinja2 runs filters on constants (like {{ 'posts/hello.md' | ref }}) when it compiles a template and keeps
+    the result in the compiled template, which then sits in the bytecode cache. Filters that get the context are never
+    run that early, so they always give the result of the current build.
+
+    :param function: The filter, without the context argument.
+
+    :return: The filter.
+    """
+    @pass_context
+    @wraps(function)
+    def build_filter(context, *args, **kwargs):
+        return function(*args, **kwargs)
+    return build_filter
+
+
+def rb_create_environment(search_path: str, cache_dir: str = None, autoescape=False) -> RBEnvironment:
+    """
+    Creates the Jinja2 Environment of a theme.
+
+    :param search_path: The directory of the theme.
+    :param cache_dir: The directory to store the compiled templates in. They are not stored if None.
+        Default: None
+    :param autoescape: Whether to escape the variables templates output. Can also be a list of the file extensions
+        (like ['html', 'xml']) of the templates to escape them in.
+        Default: False
+
+    :return: The Environment.
+    """
+    settings: dict = {
+        'jinja2': jinja2.__version__,
+        'version': bytecode_version,
+        'autoescape': autoescape,
+        'lstrip_blocks': True,
+        'trim_blocks': True,
+    }
+
+    bytecode_cache: RBBytecodeCache = RBBytecodeCache(cache_dir, settings) if cache_dir else None
+    if isinstance(autoescape, list):
+        autoescape = select_autoescape(enabled_extensions=autoescape, disabled_extensions=(),
+                                       default_for_string=False, default=False)
+
+    return RBEnvironment(loader=FileSystemLoader(searchpath=search_path), bytecode_cache=bytecode_cache,
+                         autoescape=autoescape, lstrip_blocks=True, trim_blocks=True)
+
+
+def rb_precompile_templates(env: Environment) -> list:
+    """
+    Compiles every template of a theme. With a bytecode cache, this fills the cache so the next build does not have to
+    compile anything.
+
+    :param env: The Environment of the theme.
+
+    :return: The names of the compiled templates.
+    """
+    names: list = env.list_templates(filter_func=lambda name: name.lower().endswith(template_extensions))
+    for name in names:
+        env.get_template(name)
+    return names
@@ -0,0 +1,212 @@
+from concurrent.futures import ProcessPoolExecutor
+from html import unescape
+from pathlib import PurePath
+from urllib.parse import unquote, urljoin, urlsplit
+import os
+import re
+
+from slug import slug
+
+from .errors import RBDuplicateOutputError, RBReferenceError
+
+# The attributes links are read from when the links of the rendered pages are checked.
+_rb_link_attribute = re.compile(r'''\s(?:href|src)\s*=\s*(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+
+
+def rb_content_slug(file: str, content_dir: str, content_types: list) -> str:
+    """
+    Gets the slug of a content file from its path in the content directory, without the directory of its type. Every
+    part of the path is slugified on its own, so nested directories stay in the url.
+
+    Example:
+        content/posts/2021/Hello World.md -> 2021/hello-world
+
+    :param file: The content file.
+    :param content_dir: The content directory.
+    :param content_types: The content types, like ["post", "page"]. Their plurals are the directories they are in.
+
+    :return: The slug.
+    """
+    parts: list = list(PurePath(os.path.relpath(os.path.splitext(file)[0], content_dir)).parts)
+    if len(parts) > 1 and parts[0] in [f'{content_type}s' for content_type in content_types]:
+        parts = parts[1:]
+    return '/'.join(part for part in (slug(part) for part in parts) if part)
+
+
+def _rb_strip_slashes(url: str) -> str:
+    return url.strip('/')
+
+
+class RBUrlIndex:
+    """
+    The index of every content item by its source file, its slug and its url. It is built once after the content is
+    loaded, so templates can link to an item (with the ref filter) without looping over all the content.
+
+    Items can be looked up by:
+        - their source file, with or without the content directory: "posts/hello.md" or "content/posts/hello.md"
+        - their url: "blog/hello" or "/blog/hello/"
+        - their slug: "hello", or "post:hello" when a page and a post have the same slug
+
+    Building it also checks that no two items (or an item and a listing page) are rendered to the same file.
+    """
+
+    def __init__(self, content_dir: str) -> None:
+        """
+        :param content_dir: The content directory.
+
+        :return: None
+        """
+        self.content_dir: str = content_dir
+        self.by_source: dict = dict()
+        self.by_url: dict = dict()
+        self.by_slug: dict = dict()
+        # The name of what every output file is rendered from, like a source file or "the archive".
+        self.outputs: dict = dict()
+
+    def add(self, items: list) -> None:
+        """
+        Adds content items to the index.
+
+        :param items: The items.
+
+        :return: None
+        """
+        for item in items:
+            self.reserve([f'{item.content_path_url}/index.html'], item.file_name)
+
+            source: str = PurePath(item.file_name).as_posix()
+            self.by_source[source] = item
+            self.by_source[PurePath(os.path.relpath(item.file_name, self.content_dir)).as_posix()] = item
+            self.by_url[_rb_strip_slashes(item.url)] = item
+            self.by_slug[f'{item.type}:{item.slug}'] = item
+            # ? Posts win over pages with the same slug, and the first item wins over the ones after it.
+            if item.slug not in self.by_slug or (item.type == 'post' and self.by_slug[item.slug].type != 'post'):
+                self.by_slug[item.slug] = item
+
+    def reserve(self, outputs: list, name: str) -> None:
+        """
+        Records the files something is rendered to.
+
+        :param outputs: The files.
+        :param name: What they are rendered from, used in the error.
+
+        :raises RBDuplicateOutputError: If one of the files is already rendered from something else.
+
+        :return: None
+        """
+        for output in outputs:
+            output = os.path.normpath(output)
+            if output in self.outputs:
+                raise RBDuplicateOutputError(f'"{self.outputs[output]}" and "{name}" are both rendered to "{output}". '
+                                             f'Change the slug or the url of one of them.')
+            self.outputs[output] = name
+
+    def get(self, key: str, default=None):
+        """
+        Looks an item up by its source file, url or slug.
+
+        :param key: The source file, url or slug.
+        :param default: What to return if there is no such item.
+            Default: None
+
+        :return: The item.
+        """
+        key = str(key)
+        for index, lookup_key in ((self.by_source, key.replace('\\', '/')), (self.by_url, _rb_strip_slashes(key)),
+                                  (self.by_slug, key)):
+            if lookup_key in index:
+                return index[lookup_key]
+        return default
+
+    def __getitem__(self, key: str):
+        item = self.get(key)
+        if item is None:
+            raise RBReferenceError(f'Nothing is found at "{key}". Use the source file, the url or the slug of a post '
+                                   f'or page.')
+        return item
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self.by_url)
+
+
+def rb_find_links(html: str, page_url: str, base_path: str, site_netloc: str) -> list:
+    """
+    Gets the internal links of a page as the files they point to in the output directory.
+
+    :param html: The HTML of the page.
+    :param page_url: The url of the page, relative to the site's url, like "blog/hello/".
+    :param base_path: The path of the site's url, like "/" or "/my-site/".
+    :param site_netloc: The host of the site's url. Absolute links to other hosts are not internal.
+
+    :return: The files the links point to, relative to the output directory. Links to directories end with a "/".
+    """
+    links: list = list()
+    page_path: str = f'{base_path}{page_url}'
+    for match in _rb_link_attribute.finditer(html):
+        link: str = unescape(match.group(1) if match.group(1) is not None else match.group(2)).strip()
+        if not link or link.startswith(('#', '//')):
+            continue
+        parts = urlsplit(link)
+        if parts.scheme or parts.netloc:
+            if parts.scheme not in ('http', 'https') or parts.netloc != site_netloc:
+                continue
+
+        target: str = urlsplit(urljoin(page_path, link)).path
+        if not target.startswith(base_path):
+            continue
+        links.append(unquote(target[len(base_path):]))
+    return links
+
+
+def _rb_find_links_in_files(args: tuple) -> list:
+    files, out_dir, base_path, site_netloc = args
+    results: list = list()
+    for file in files:
+        with open(f'{out_dir}/{file}', 'r', encoding='utf-8', errors='replace') as html_file:
+            html: str = html_file.read()
+        page_url: str = file[:-len('index.html')] if file.endswith('index.html') else file
+        results.append((file, rb_find_links(html, page_url, base_path, site_netloc)))
+    return results
+
+
+def rb_check_links(out_dir: str, site_url: str, jobs: int = 1) -> list:
+    """
+    Checks that every internal link (href and src) in the HTML files of the output directory points to a file that is
+    there. The pages are read and searched for links on a pool of processes when there are a lot of them.
+
+    :param out_dir: The output directory.
+    :param site_url: The url of the site. Absolute links to it are checked too.
+    :param jobs: The number of processes that read the pages.
+        Default: 1
+
+    :return: The broken links, as tuples of the page (relative to the output directory) and the file it links to.
+    """
+    existing: set = set()
+    pages: list = list()
+    for directory, _, names in os.walk(out_dir):
+        for name in names:
+            file: str = os.path.relpath(os.path.join(directory, name), out_dir).replace(os.sep, '/')
+            existing.add(file)
+            if file.endswith(('.html', '.htm')):
+                pages.append(file)
+
+    site: tuple = urlsplit(site_url)
+    base_path: str = site.path if site.path.endswith('/') else f'{site.path}/'
+    if jobs > 1 and len(pages) > 64:
+        chunks: list = [(pages[index::jobs * 4], out_dir, base_path, site.netloc) for index in range(jobs * 4)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results: list = [result for chunk in executor.map(_rb_find_links_in_files, chunks) for result in chunk]
+    else:
+        results = _rb_find_links_in_files((pages, out_dir, base_path, site.netloc))
+
+    broken: list = list()
+    for page, links in sorted(results):
+        for link in links:
+            # ? Links to directories are served their index.html.
+            if link in existing or f'{link.rstrip("/")}/index.html'.lstrip('/') in existing:
+                continue
+            broken.append((page, link or '/'))
+    return broken
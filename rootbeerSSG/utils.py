@@ -1,10 +1,15 @@
-from shutil import rmtree
-from distutils import dir_util
+from shutil import copytree, rmtree
 from subprocess import check_call, DEVNULL
 from sys import executable
 from typing import KeysView
+from hashlib import sha256
+from importlib.util import find_spec
+import re
+import json
 import os
 
+from jinja2 import Environment, meta, nodes
+
 
 def rb_create_path_if_does_not_exist(path: str) -> None:
     """
@@ -39,7 +44,7 @@ def rb_copy_static_files_to_public_directory(path1: str, path2: str) -> None:
     :return: None
     """
     # Copy all static files (i.e. css/ img/) to the public folder so paths dont break.
-    dir_util.copy_tree(f'{path1}/static', path2)
+    copytree(f'{path1}/static', path2, dirs_exist_ok=True)
 
 
 def rb_install_markdown_extras_modules(modules_to_install: KeysView[str]) -> None:
@@ -53,4 +58,208 @@ def rb_install_markdown_extras_modules(modules_to_install: KeysView[str]) -> Non
     install_command: list = [executable, '-m', 'pip', 'install']
     for module in modules_to_install:
         install_command.append(module)
-    check_call(install_command, stdout=DEVNULL)
\ No newline at end of file
+    check_call(install_command, stdout=DEVNULL)
+
+
+def rb_find_missing_markdown_extensions(extensions: dict) -> dict:
+    """
+    Finds the markdown extentions that are not installed, without importing any of them.
+
+    :param extensions: The extentions, as a dict of their install names and their import names.
+
+    :return: The extentions that are not installed, in the same form.
+    """
+    missing: dict = dict()
+    entry_points: set = None
+    for install_name, import_name in extensions.items():
+        module: str = import_name.split(':')[0]
+        try:
+            if find_spec(module) is not None:
+                continue
+        except (ImportError, ValueError):
+            pass
+
+        # ? Extentions can also be registered under a short name, like "toc". Those are only looked up (and
+        # ? importlib.metadata only imported) if needed because reading the entry points of every package is slow.
+        if entry_points is None:
+            from importlib import metadata
+
+            groups = metadata.entry_points()
+            # ? Python 3.8 and 3.9 give a dict of the groups, selecting a group by name came in 3.10.
+            if hasattr(groups, 'select'):
+                found = groups.select(group='markdown.extensions')
+            else:
+                found = groups.get('markdown.extensions', [])
+            entry_points = {entry_point.name for entry_point in found}
+        if import_name not in entry_points:
+            missing[install_name] = import_name
+    return missing
+
+
+def rb_hash_text(text: str) -> str:
+    """
+    Hashes a string.
+
+    :param text: The string to hash.
+
+    :return: The hex digest of the string.
+    """
+    return sha256(text.encode('utf-8')).hexdigest()
+
+
+def _rb_string_keys(value):
+    if isinstance(value, dict):
+        return {str(key): _rb_string_keys(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_rb_string_keys(item) for item in value]
+    return value
+
+
+def rb_hash_config(config: dict) -> str:
+    """
+    Hashes the site config so builds can tell if it changed.
+
+    :param config: The site config.
+
+    :return: The hex digest of the config.
+    """
+    # ? The keys are made strings first because YAML keys can be null (like "~: fenced_code") and json can't sort those.
+    return rb_hash_text(json.dumps(_rb_string_keys(config), sort_keys=True, default=str))
+
+
+def rb_hash_template(env: Environment, template_name: str) -> dict:
+    """
+    Hashes a template and every template it extends, includes or imports.
+
+    :param env: The environment the template is loaded from.
+    :param template_name: The name of the template.
+
+    :return: A dict of the names of the templates and their hashes.
+    """
+    hashes: dict = dict()
+    templates_to_check: list = [template_name]
+
+    while templates_to_check:
+        name: str = templates_to_check.pop()
+        if name in hashes:
+            continue
+
+        source: str = env.loader.get_source(env, name)[0]
+        hashes[name] = rb_hash_text(source)
+
+        for referenced in meta.find_referenced_templates(env.parse(source)):
+            # ? Dynamic references (like {% include some_variable %}) are None and can't be tracked.
+            if referenced is not None:
+                templates_to_check.append(referenced)
+
+    return hashes
+
+
+def rb_find_site_uses(env: Environment, template_names: list) -> set:
+    """
+    Finds what templates use of the site: the fields of the "rootbeer" variable they read (like "posts" in
+    rootbeer.posts) and "ref" if they call the ref filter or function. If a template uses "rootbeer" in a way that
+    can't be followed (like passing it to a macro), "rootbeer" is in the set too.
+
+    :param env: The environment the templates are loaded from.
+    :param template_names: The names of the templates, like the ones rb_hash_template found.
+
+    :return: The set of what they use.
+    """
+    uses: set = set()
+    for template_name in template_names:
+        tree: nodes.Template = env.parse(env.loader.get_source(env, template_name)[0])
+
+        followed: set = set()
+        for node in tree.find_all((nodes.Getattr, nodes.Getitem)):
+            if isinstance(node.node, nodes.Name) and node.node.name == 'rootbeer':
+                followed.add(id(node.node))
+                if isinstance(node, nodes.Getattr):
+                    uses.add(node.attr)
+                elif isinstance(node.arg, nodes.Const):
+                    uses.add(str(node.arg.value))
+                else:
+                    uses.add('rootbeer')
+
+        for node in tree.find_all(nodes.Name):
+            if node.name == 'rootbeer' and id(node) not in followed:
+                uses.add('rootbeer')
+            elif node.name == 'ref':
+                uses.add('ref')
+        if any(node.name == 'ref' for node in tree.find_all(nodes.Filter)):
+            uses.add('ref')
+
+    return uses
+
+
+def rb_remove_output_file(file: str, root: str) -> None:
+    """
+    Removes a file and then every parent directory that was left empty, up to (but not including) the root.
+
+    :param file: The file to remove.
+    :param root: The directory to stop at.
+
+    :return: None
+    """
+    if os.path.exists(file):
+        os.remove(file)
+
+    root = os.path.abspath(root)
+    directory: str = os.path.dirname(os.path.abspath(file))
+    while directory.startswith(root) and directory != root and os.path.isdir(directory) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+
+def rb_content_sort_value(item, sort_by: str):
+    """
+    Gets the value a content item is sorted by.
+
+    :param item: The content item. See RBContent.
+    :param sort_by: The field to sort by. Fields of the item itself (like the parsed "date", "slug" or "url") are used
+        before the fields in its metadata.
+
+    :return: The value or None if the item does not have the field.
+    """
+    if sort_by not in ('metadata', 'content', 'site', 'extra'):
+        value = getattr(item, sort_by, None)
+        if value is not None:
+            return value
+    return item.metadata.get(sort_by)
+
+
+def rb_sort_content(items: list, sort_by: str, reverse: bool = False) -> list:
+    """
+    Sorts content items by one of their fields. Every item's sort value is only looked up once. Items that don't have
+    the field are put at the end in the order they were loaded in.
+
+    :param items: The content items to sort.
+    :param sort_by: The field to sort by. See rb_content_sort_value.
+    :param reverse: Whether to sort from the largest to the smallest value.
+        Default: False
+
+    :return: A new sorted list of the items.
+    """
+    keys: list = [rb_content_sort_value(item, sort_by) for item in items]
+    with_key: list = [index for index, key in enumerate(keys) if key is not None]
+    without_key: list = [index for index, key in enumerate(keys) if key is None]
+
+    try:
+        with_key.sort(key=keys.__getitem__, reverse=reverse)
+    except TypeError:
+        # ? The values can't be compared with each other (like a mix of numbers and text) so compare them as text.
+        with_key.sort(key=lambda index: str(keys[index]), reverse=reverse)
+
+    return [items[index] for index in with_key] + [items[index] for index in without_key]
+
+
+def rb_first_paragraph(html: str) -> str:
+    """
+    Gets the first paragraph of some HTML.
+
+    :param html: The HTML.
+
+    :return: The first paragraph, including its <p> tags, or an empty string if there is none.
+    """
+    match = re.search(r'<p>.*?</p>', html, re.DOTALL)
+    return match.group(0) if match else ''
@@ -34,7 +34,17 @@ setup(
         'Markdown',
         'markdown-full-yaml-metadata',
         'MarkupSafe',
+        'paginate',
         'PyYAML',
         'slug'
     ],
+    extras_require={
+        'images': ['Pillow'],
+        'brotli': ['Brotli'],
+    },
+    entry_points={
+        'console_scripts': [
+            'rootbeer=rootbeerSSG.cli:main',
+        ],
+    },
 )
@@ -0,0 +1,21 @@
+from unittest import TestCase, main
+
+import yaml
+
+from rootbeerSSG.utils import rb_hash_config
+
+
+class TestHashConfig(TestCase):
+    def test_null_markdown_extension_key(self) -> None:
+        # ? The config comments tell users to write built in markdown extentions as "~: fenced_code".
+        config: dict = yaml.safe_load('markdown_extentions:\n  ~: fenced_code\n  markdown-full-yaml-metadata: '
+                                      'full_yaml_metadata\n')
+        self.assertIsNone(next(iter(config['markdown_extentions'])))
+        self.assertEqual(rb_hash_config(config), rb_hash_config(config))
+
+    def test_changes_with_the_config(self) -> None:
+        self.assertNotEqual(rb_hash_config({None: 'fenced_code'}), rb_hash_config({None: 'tables'}))
+
+
+if __name__ == '__main__':
+    main()